@@ -2,36 +2,36 @@
 Main GUI application for Lokality.
 Orchestrates the chat interface, model interaction, and UI components.
 """
+import functools
 import logging
-import os
-import queue
-import signal
 import sys
 import threading
+import time
 import tkinter as tk
 import traceback
 from tkinter import font
 
-import mistune
 import ollama
-from mistune.plugins.formatting import superscript, subscript
 
 import config
-import local_assistant
 from complexity_scorer import ComplexityScorer
 from config import VERSION
 from logger import logger
-from markdown_engine import MarkdownEngine
+from markdown_engine import MarkdownEngine, create_markdown_parser, find_stable_boundary
 from settings import Settings
-from shell_integration import run_ollama_bypass
+from shell_integration import reap_process, run_ollama_bypass
 import theme as Theme
-from app_state import AppState, AppUI, CanvasConfig, SLASH_COMMANDS
-from ui_components import CustomScrollbar, InfoPanel
+from app_state import (
+    AppState, AppUI, CanvasConfig, SLASH_COMMANDS, SLASH_COMMAND_NAMES, SLASH_COMMAND_SET
+)
+from ui_components import CustomScrollbar, InfoPanel, Tooltip
 from ui_helpers import (
     update_canvas_region, update_lower_border, highlight_commands, handle_tab,
-    adjust_input_height
+    adjust_input_height, coalesce_text_actions, create_jump_button, build_model_sidebar,
+    configure_chat_tags, debounce, editable, trim_chat_history, INPUT_PAD_Y
 )
 from utils import (
+    CoalescingWorker,
     RedirectedStdout,
     debug_print,
     error_print,
@@ -45,6 +45,47 @@ from utils import (
 
 threading.excepthook = thread_excepthook
 
+# Text tags whose consecutive queue chunks are merged into one widget insert
+COALESCED_TEXT_TAGS = ("assistant", "system", "error")
+
+# yview()[1] at or above which the chat counts as scrolled to the bottom
+SCROLL_BOTTOM_THRESHOLD = 0.99
+
+# Queue action -> name of the AssistantApp method applying it on the Tk thread
+QUEUE_ACTION_HANDLERS = {
+    "text": "_on_text_action",
+    "start_indicator": "_on_start_indicator_action",
+    "replace_last": "_replace_last_message",
+    "clear": "_on_clear_action",
+    "separator": "_on_separator_action",
+    "final_render": "_on_final_render_action",
+    "toggle_info": "_on_toggle_info_action",
+    "update_info_ui": "_on_update_info_action",
+    "enable": "_on_enable_action",
+    "set_parser": "_on_set_parser_action",
+    "quit": "_on_quit_action",
+}
+
+SEARCH_INSTRUCTION_TEMPLATE = (
+    "CRITICAL FACTUAL OVERRIDE: You MUST use the following search "
+    "data to answer. This data is THE current reality.\n\n"
+    "<SEARCH_CONTEXT>\n{context}\n</SEARCH_CONTEXT>\n\n"
+    "ORIGINAL INTENT: Find: '{query}'\n\n"
+    "STRICT DIRECTIVES:\n"
+    "1. Answer using ONLY relevant facts from <SEARCH_CONTEXT>.\n"
+    "2. NEVER mention internal tags like '<SEARCH_CONTEXT>'.\n"
+    "3. Ignore noise. 4. If data is missing, admit it."
+)
+
+# First word of the input -> name of the AssistantApp method handling it
+COMMAND_HANDLERS = {
+    '/clear': '_cmd_clear', '/debug': '_cmd_debug',
+    '/forget': '_cmd_forget', '/info': '_cmd_info',
+    '/help': '_cmd_help', '/exit': '_cmd_exit',
+    '/model': '_cmd_model', '/bypass': '_cmd_bypass',
+    'exit': '_cmd_exit', 'quit': '_cmd_exit'
+}
+
 class AssistantApp:
     """The main application class for the Lokality GUI."""
     def __init__(self, root):
@@ -58,6 +99,7 @@ class AssistantApp:
         self.fonts = Theme.get_fonts()
         self.settings = Settings()
         self.state = AppState()
+        self.state.process.info_worker = CoalescingWorker(self._fetch_info, "info")
 
         # Load persistent toggles
         config.DEBUG = self.settings.get("debug", False)
@@ -73,7 +115,10 @@ class AssistantApp:
 
         self.root.bind("<Escape>", self._cancel_generation)
         self.root.protocol("WM_DELETE_WINDOW", self._on_close)
-        self.root.after(100, self._check_queue)
+        self.state.msg_queue.wake = self._wake_queue
+        # Drains are event-driven from here on; this one-shot covers anything
+        # queued before the main loop started
+        self.root.after(100, self._drain_queue)
 
         sys.stdout = RedirectedStdout(self.state.msg_queue, "system")
         sys.stderr = RedirectedStdout(self.state.msg_queue, "error")
@@ -82,38 +127,49 @@ class AssistantApp:
         threading.Thread(target=self._initialize_async, daemon=True).start()
 
     def _setup_markdown(self):
-        """Initializes the markdown engine and parser."""
+        """Initializes the markdown engine with a plain-text parser until mistune loads."""
+        self.markdown_engine = MarkdownEngine(
+            None, self._handle_tooltip
+        )
+        self.md_parser = lambda x: [{"type": "text", "text": x}]
+
+    def _load_markdown_parser(self):
+        """Builds the mistune parser off the Tk thread and hands it to the Tk thread."""
         try:
-            self.markdown_engine = MarkdownEngine(
-                None, self._handle_tooltip
-            )
-            self.md_parser = mistune.create_markdown(
-                renderer=None,
-                plugins=['table', 'strikethrough', superscript, subscript]
-            )
-        except (ImportError, AttributeError):
-            self.markdown_engine = MarkdownEngine(
-                None, self._handle_tooltip
-            )
-            self.md_parser = lambda x: [{"type": "text", "text": x}]
+            parser = create_markdown_parser()
+        except (ImportError, AttributeError) as exc:
+            debug_print(f"Markdown parser unavailable: {exc}")
+            return
+        self.state.msg_queue.put(("set_parser", parser, None))
 
     def _initialize_async(self):
-        """Heavy initialization tasks run in background."""
+        """Heavy initialization tasks run in background, independent ones in parallel."""
+        # The environment check does not depend on the assistant, so it overlaps
+        # with model discovery/pull instead of waiting for it.
+        health_check = threading.Thread(target=self._report_env_health, daemon=True)
+        health_check.start()
+        self._load_markdown_parser()
         try:
+            # Imported here: the search/memory stack would otherwise delay the first paint
+            import local_assistant
             self.state.assistant = local_assistant.LocalChatAssistant()
             info_print("Chat Assistant ready.")
 
             # Initial info update if panel is visible
             self._update_info_display()
 
-            _, errors = verify_env_health()
-            for err in errors:
-                error_print(f"Environment check failed: {err}")
-
+            health_check.join()
             print("Type /help for commands.\n")
         except (ImportError, RuntimeError, ValueError, ConnectionError) as exc:
             error_print(f"Initialization failed: {format_error_msg(exc)}")
 
+    @staticmethod
+    def _report_env_health():
+        """Runs startup environment checks and reports any failures."""
+        _, errors = verify_env_health()
+        for err in errors:
+            error_print(f"Environment check failed: {err}")
+
     def handle_tk_exception(self, exc, val, tback):
         """Global hook for catching Tkinter callback exceptions."""
         err_msg = f"GUI Error: {exc.__name__}: {val}"
@@ -132,6 +188,7 @@ class AssistantApp:
         self.markdown_engine.text_widget = self.ui.chat.display
 
         self.ui.info_panel = InfoPanel(self.root, Theme, self.fonts)
+        self.ui.tooltip = Tooltip(self.root, Theme, self.fonts["tooltip"])
         self.ui.info_panel.show_info = self.state.ui_state.show_info
         self.ui.info_panel.grid(row=1, column=0, columnspan=2, sticky="ew", padx=10, pady=0)
         if not self.state.ui_state.show_info:
@@ -174,7 +231,9 @@ class AssistantApp:
             font=self.fonts["base"], bg=Theme.BG_COLOR, fg=Theme.FG_COLOR,
             insertbackground=Theme.FG_COLOR, borderwidth=0,
             highlightthickness=0, padx=15, pady=15,
-            spacing1=1, spacing2=3, spacing3=1
+            spacing1=1, spacing2=3, spacing3=1,
+            # Read-only log: keep streamed inserts off the undo stack
+            undo=False, autoseparators=False, maxundo=0
         )
         self.ui.chat.display.grid(row=0, column=0, sticky="nsew")
 
@@ -187,51 +246,20 @@ class AssistantApp:
         # Modified scroll command to track auto-scroll state
         def on_display_scroll(*args):
             self.ui.chat.scrollbar.set(*args)
-            self._check_scroll_position()
+            self._check_scroll_position(float(args[1]))
 
         self.ui.chat.display.config(yscrollcommand=on_display_scroll)
 
         # "Jump to latest" button (Canvas-based for styling)
-        self.ui.chat.jump_btn_canvas = tk.Canvas(
-            self.root, width=300, height=80,
-            bg=Theme.BG_COLOR, highlightthickness=0, bd=0
-        )
-
-        # Shadow (drawn first)
-        round_rectangle(
-            self.ui.chat.jump_btn_canvas, (8, 8, 292, 72), radius=25,
-            fill="#111111", outline="", width=0, tags="btn_shadow"
-        )
-
-        # Draw the button content
-        round_rectangle(
-            self.ui.chat.jump_btn_canvas, (2, 2, 284, 64), radius=25,
-            fill=Theme.JUMP_BTN_BG, outline="", width=0, tags="btn_bg"
+        self.ui.chat.jump_btn_canvas = create_jump_button(
+            self.root, self.fonts, self.scroll_to_bottom
         )
 
-        # Text (Simple, no border)
-        self.ui.chat.jump_btn_canvas.create_text(
-            143, 33, text="↓   Jump to latest", fill=Theme.FG_COLOR,
-            font=self.fonts["bold"], tags="btn_text"
-        )
-
-        # Bindings
-        for tag in ("btn_bg", "btn_text", "btn_shadow"):
-            self.ui.chat.jump_btn_canvas.tag_bind(
-                tag, "<Button-1>", lambda e: self.scroll_to_bottom()
-            )
-            self.ui.chat.jump_btn_canvas.tag_bind(
-                tag, "<Enter>",
-                lambda e: self.ui.chat.jump_btn_canvas.config(cursor="hand2")
-            )
-            self.ui.chat.jump_btn_canvas.tag_bind(
-                tag, "<Leave>",
-                lambda e: self.ui.chat.jump_btn_canvas.config(cursor="")
-            )
-
-        self._configure_tags()
+        configure_chat_tags(self.ui.chat.display, self.fonts)
         self.ui.chat.display.mark_set("assistant_msg_start", "1.0")
         self.ui.chat.display.mark_gravity("assistant_msg_start", tk.LEFT)
+        self.ui.chat.display.mark_set("assistant_stable_end", "1.0")
+        self.ui.chat.display.mark_gravity("assistant_stable_end", tk.LEFT)
 
         # Bind user scroll events to disable auto-scroll
         self.ui.chat.display.bind("<MouseWheel>", self._on_manual_scroll)
@@ -242,6 +270,7 @@ class AssistantApp:
     def _setup_input_area(self):
         """Sets up the user input field at the bottom."""
         line_h = font.Font(font=self.fonts["base"]).metrics('linespace')
+        self.ui.input.line_h = int(line_h)
         self.ui.input.canvas = tk.Canvas(
             self.root, bg=Theme.BG_COLOR, highlightthickness=0,
             height=line_h + 20
@@ -264,7 +293,7 @@ class AssistantApp:
             self.ui.input.inner, height=1, width=1, wrap='word',
             font=self.fonts["base"], bg=Theme.INPUT_BG, fg=Theme.FG_COLOR,
             insertbackground=Theme.FG_COLOR, borderwidth=0,
-            highlightthickness=0, padx=15, pady=10
+            highlightthickness=0, padx=15, pady=INPUT_PAD_Y
         )
         self.ui.input.field.grid(row=0, column=0, sticky="nsew")
         self.ui.input.field.tag_config(
@@ -272,32 +301,6 @@ class AssistantApp:
             font=self.fonts["bold"]
         )
 
-    def _configure_tags(self):
-        """Sets up text tags for different message types."""
-        cfg = self.ui.chat.display.tag_config
-        cfg("user", foreground=Theme.USER_COLOR, font=self.fonts["bold"])
-        cfg("assistant", foreground=Theme.FG_COLOR, font=self.fonts["base"])
-        cfg("indicator", foreground=Theme.INDICATOR_COLOR, font=self.fonts["indicator"])
-        cfg("system", foreground=Theme.SYSTEM_COLOR, font=self.fonts["small"],
-            tabs=("240",))
-        cfg("error", foreground=Theme.ERROR_COLOR)
-        cfg("cancelled", foreground=Theme.CANCELLED_COLOR, font=self.fonts["bold"])
-        cfg("md_bold", font=self.fonts["bold"])
-        cfg("md_italic", font=self.fonts["italic"])
-        cfg("md_bold_italic", font=self.fonts["bold_italic"])
-        cfg("md_sub", font=self.fonts["small_base"], offset=-2)
-        cfg("md_sup", font=self.fonts["small_base"], offset=4)
-        cfg("md_strikethrough", overstrike=True)
-        cfg("md_code", font=self.fonts["code"], background=Theme.CODE_BG,
-            foreground=Theme.CODE_FG)
-        cfg("md_h1", font=self.fonts["h1"], spacing1=10, spacing3=5)
-        cfg("md_h2", font=self.fonts["h2"], spacing1=8, spacing3=4)
-        cfg("md_h3", font=self.fonts["h3"], spacing1=6, spacing3=3)
-        cfg("md_link", foreground=Theme.LINK_COLOR)
-        cfg("md_quote", font=self.fonts["italic"], foreground=Theme.SYSTEM_COLOR,
-            lmargin1=40, lmargin2=40)
-        cfg("md_quote_bar", foreground=Theme.ACCENT_COLOR, font=self.fonts["bold"])
-
     def _bind_events(self):
         """Binds GUI events to their respective handlers."""
         self.ui.chat.canvas.bind("<Configure>", self._on_chat_canvas_configure)
@@ -309,53 +312,50 @@ class AssistantApp:
         self.ui.input.field.bind("<Configure>", self._adjust_input_height)
 
     def _stop_active_process(self):
-        """Safely terminates any active background process."""
-        if self.state.process.active:
-            try:
-                if self.state.process.active.poll() is None:
-                    os.kill(self.state.process.active.pid, signal.SIGTERM)
-            except OSError:
-                pass
-            self.state.process.active = None
-
-    def _update_canvas_region(self, cfg: CanvasConfig):
-        return update_canvas_region(cfg)
+        """Safely terminates any active background process; repeat calls are no-ops."""
+        # Detach before signalling so later calls (worker cleanup, cancel, close) are no-ops
+        proc, self.state.process.active = self.state.process.active, None
+        if proc is None:
+            return
+        try:
+            if proc.poll() is None:
+                proc.terminate()
+        except OSError:
+            pass
 
     def _on_chat_canvas_configure(self, event):
-        """Updates the chat area border on resize."""
-        if event.width < 50 or event.height < 50:
+        """Schedules a chat area border update on resize."""
+        size = (event.width, event.height)
+        # Moves and restacking also send <Configure>; only a new size needs a redraw
+        if event.width < 50 or event.height < 50 or size == self.ui.sizes.get("chat_canvas"):
             return
+        self.ui.sizes["chat_canvas"] = size
+        debounce(
+            self.root, self.ui.debounce_jobs, "chat",
+            lambda: self._redraw_chat_border(*size)
+        )
+
+    def _redraw_chat_border(self, width, height):
+        """Redraws the chat area border at the given size."""
+        self.ui.debounce_jobs.pop("chat", None)
         cfg = CanvasConfig(
             canvas=self.ui.chat.canvas,
             bg_id=self.ui.chat.bg_id,
-            size=(event.width, event.height),
+            size=(width, height),
             radius=25,
             style=(Theme.ACCENT_COLOR, 6, Theme.BG_COLOR),
             win_id=self.ui.chat.window_id,
             pad=(12, 12)
         )
-        self.ui.chat.bg_id = self._update_canvas_region(cfg)
-
-    def _on_sidebar_canvas_configure(self, event):
-        """Maintains the sidebar background shape on resize."""
-        w, h = event.width, event.height
-        cfg = CanvasConfig(
-            canvas=self.ui.sidebar.canvas,
-            bg_id=self.ui.sidebar.bg_id,
-            size=(w, h),
-            radius=25,
-            style=(Theme.ACCENT_COLOR, 6, Theme.INPUT_BG),
-            win_id=self.ui.sidebar.window_id,
-            pad=(12, 12)
-        )
-        self.ui.sidebar.bg_id = self._update_canvas_region(cfg)
+        self.ui.chat.bg_id = update_canvas_region(cfg)
 
     def _on_manual_scroll(self, _):
         """Disables auto-scroll when user interacts with the chat history."""
         # Only disable if user actually scrolls UP
-        if self.ui.chat.display.yview()[1] < 0.99:
+        bottom = self.ui.chat.display.yview()[1]
+        if bottom < SCROLL_BOTTOM_THRESHOLD:
             self.state.auto_scroll = False
-            self._check_scroll_position()
+            self._check_scroll_position(bottom)
 
     def scroll_to_bottom(self):
         """Scrolls the chat display to the very bottom."""
@@ -363,16 +363,23 @@ class AssistantApp:
         self.ui.chat.display.see(tk.END)
         self._check_scroll_position()
 
-    def _check_scroll_position(self):
-        """Shows or hides the jump button based on scroll state."""
+    def _check_scroll_position(self, bottom=None):
+        """Shows or hides the jump button; `bottom` is yview()[1] if the caller has it."""
         if not self.ui.chat.jump_btn_canvas:
             return
 
-        is_at_bottom = self.ui.chat.display.yview()[1] >= 0.99
-        if is_at_bottom:
+        if bottom is None:
+            bottom = self.ui.chat.display.yview()[1]
+        # Place/forget only on a visibility change; the placer keeps the relative
+        # position through resizes, so repeat scroll events leave the button alone
+        ui_state = self.state.ui_state
+        if bottom >= SCROLL_BOTTOM_THRESHOLD:
             self.state.auto_scroll = True
-            self.ui.chat.jump_btn_canvas.place_forget()
-        elif not self.state.auto_scroll:
+            if ui_state.jump_btn_visible:
+                ui_state.jump_btn_visible = False
+                self.ui.chat.jump_btn_canvas.place_forget()
+        elif not self.state.auto_scroll and not ui_state.jump_btn_visible:
+            ui_state.jump_btn_visible = True
             # Place relative to the container. Since jump_btn_canvas parent is ui.chat.canvas,
             # and ui.chat.canvas fills the area, this works.
             # However, ensure it's on top. 'place' usually puts it on top.
@@ -383,19 +390,38 @@ class AssistantApp:
             self.root.tk.call('raise', str(self.ui.chat.jump_btn_canvas))
 
     def _on_lower_canvas_configure(self, event):
-        """Updates the input area border on resize."""
+        """Schedules an input area border update on resize."""
+        size = (event.width, event.height)
+        if size == self.ui.sizes.get("input_canvas"):
+            return
+        self.ui.sizes["input_canvas"] = size
         if event.width > 50 and event.height > 20:
-            self._update_lower_border()
-
-    def _adjust_input_height(self, _=None):
-        adjust_input_height(self.ui.input)
-
-
-    def _update_lower_border(self, forced_h=None):
-        self.ui.input.bg_id = update_lower_border(self.ui.input, forced_h)
+            debounce(self.root, self.ui.debounce_jobs, "input", self._redraw_lower_border)
+
+    def _redraw_lower_border(self):
+        """Redraws the input area border once resize events settle."""
+        self.ui.debounce_jobs.pop("input", None)
+        self._update_lower_border()
+
+    def _adjust_input_height(self, event=None):
+        """Queues one height pass per idle cycle, however many triggers fire before it."""
+        if event is not None:
+            self.ui.sizes["input_field"] = event.width
+        if "input_height" not in self.ui.debounce_jobs:
+            self.ui.debounce_jobs["input_height"] = self.root.after_idle(self._apply_input_height)
+
+    def _apply_input_height(self):
+        self.ui.debounce_jobs.pop("input_height", None)
+        canvas_w, _ = self.ui.sizes.get("input_canvas", (0, 0))
+        adjust_input_height(self.ui.input, self.ui.sizes.get("input_field", 0), canvas_w)
+
+    def _update_lower_border(self):
+        self.ui.input.bg_id = update_lower_border(
+            self.ui.input, self.ui.sizes.get("input_canvas", (0, 0))
+        )
 
     def _handle_tab(self, _):
-        return handle_tab(self.ui.input, SLASH_COMMANDS)
+        return handle_tab(self.ui.input, SLASH_COMMAND_NAMES)
 
     def _handle_return(self, event):
         """Sends the message on Enter, inserts newline on Shift+Enter."""
@@ -405,14 +431,19 @@ class AssistantApp:
         return None
 
     def _on_key_release(self, event=None):
-        """Triggers command highlighting and height adjustment."""
+        """Schedules command highlighting and height adjustment."""
         if event and event.keysym in ("Shift_L", "Shift_R"):
             return
-        highlight_commands(self.ui.input, SLASH_COMMANDS)
-        self._adjust_input_height()
+        debounce(
+            self.root, self.ui.debounce_jobs, "typing",
+            self._on_typing_settled, config.KEY_RELEASE_DEBOUNCE_MS
+        )
 
-    def _highlight_commands(self):
-        highlight_commands(self.ui.input, SLASH_COMMANDS)
+    def _on_typing_settled(self):
+        """Runs the per-keystroke work once for a whole burst of keys."""
+        self.ui.debounce_jobs.pop("typing", None)
+        highlight_commands(self.ui.input, SLASH_COMMAND_SET)
+        self._adjust_input_height()
 
     def send_message(self):
         """Validates input and initiates assistant processing."""
@@ -432,19 +463,14 @@ class AssistantApp:
     def _get_assistant_msgs(self, user_input, search_context):
         """Constructs the message list for the LLM."""
         msgs = [
-            {"role": "system", "content": self.state.assistant.system_prompt}
-        ] + self.state.assistant.messages + [{"role": "user", "content": user_input}]
+            {"role": "system", "content": self.state.assistant.system_prompt},
+            *self.state.assistant.messages,
+            {"role": "user", "content": user_input}
+        ]
 
         if search_context:
-            final_instr = (
-                "CRITICAL FACTUAL OVERRIDE: You MUST use the following search "
-                "data to answer. This data is THE current reality.\n\n"
-                f"<SEARCH_CONTEXT>\n{search_context}\n</SEARCH_CONTEXT>\n\n"
-                f"ORIGINAL INTENT: Find: '{user_input}'\n\n"
-                "STRICT DIRECTIVES:\n"
-                "1. Answer using ONLY relevant facts from <SEARCH_CONTEXT>.\n"
-                "2. NEVER mention internal tags like '<SEARCH_CONTEXT>'.\n"
-                "3. Ignore noise. 4. If data is missing, admit it."
+            final_instr = SEARCH_INSTRUCTION_TEMPLATE.format(
+                context=search_context, query=user_input
             )
             msgs.append({"role": "system", "content": final_instr})
         return msgs
@@ -452,17 +478,26 @@ class AssistantApp:
     def _run_streaming_chat(self, user_input, complexity, msgs):
         """Handles the streaming response from the LLM."""
         try:
-            full_resp = ""
+            full_resp = pending = ""
+            last_flush = time.monotonic()
             stream = get_ollama_client().chat(
                 model=config.MODEL_NAME, messages=msgs,
                 stream=True, options=complexity['params']
             )
             for chunk in stream:
-                if self.state.process.stop_generation:
+                if self.state.process.stop_generation.is_set():
                     break
                 cnt = chunk['message']['content']
                 full_resp += cnt
-                self.state.msg_queue.put(("text", cnt, "assistant"))
+                pending += cnt
+                # Coalesce tokens so the UI renders per word/line, not per token
+                now = time.monotonic()
+                if ("\n" in cnt or len(pending) >= config.STREAM_FLUSH_CHARS
+                        or now - last_flush >= config.STREAM_FLUSH_INTERVAL):
+                    self.state.msg_queue.put(("text", pending, "assistant"))
+                    pending, last_flush = "", now
+            if pending:
+                self.state.msg_queue.put(("text", pending, "assistant"))
 
             self._finalize_chat_response(user_input, full_resp)
         except (ollama.ResponseError, AttributeError, ConnectionError) as exc:
@@ -470,7 +505,7 @@ class AssistantApp:
 
     def _finalize_chat_response(self, user_input, full_resp):
         """Stores result and triggers final rendering."""
-        if self.state.process.stop_generation:
+        if self.state.process.stop_generation.is_set():
             self.state.msg_queue.put(("text", " [Interrupted]", "cancelled"))
             res = full_resp + " [Interrupted]"
         else:
@@ -483,30 +518,18 @@ class AssistantApp:
         ])
 
         self.state.msg_queue.put(("final_render", "", "assistant"))
-        if not self.state.process.stop_generation:
+        if not self.state.process.stop_generation.is_set():
             self.state.assistant.update_memory_async(user_input, full_resp)
 
-        if len(self.state.assistant.messages) > 20:
-            self.state.assistant.messages = self.state.assistant.messages[-20:]
-
     def process_input(self, user_input):
         """Orchestrates complexity analysis, search, and LLM chat."""
-        self.state.process.stop_generation = False
+        self.state.process.stop_generation.clear()
         try:
-            cmd_map = {
-                '/clear': self._cmd_clear, '/debug': self._cmd_debug,
-                '/forget': self._cmd_forget, '/info': self._cmd_info,
-                '/help': self._cmd_help, '/exit': self._cmd_exit,
-                '/model': self._cmd_model,
-                'exit': self._cmd_exit, 'quit': self._cmd_exit
-            }
-            parts = user_input.lower().split()
-            first = parts[0] if parts else ""
-            if first in cmd_map:
-                cmd_map[first](user_input)
-                return
-            if first == '/bypass':
-                self._cmd_bypass(user_input)
+            # Commands are short, so a bounded slice is enough to find the first word
+            head = user_input.lstrip()[:16].split(None, 1)
+            handler = COMMAND_HANDLERS.get(head[0].lower() if head else "")
+            if handler:
+                getattr(self, handler)(user_input)
                 return
 
             self.state.msg_queue.put(("start_indicator", None, None))
@@ -516,11 +539,17 @@ class AssistantApp:
                     complexity = ComplexityScorer.analyze(user_input)
 
                     skip_search = complexity['level'] == ComplexityScorer.LEVEL_MINIMAL
+                    # The fact lookup for the prompt does not depend on the
+                    # search, so overlap it with the (network-bound) decision.
+                    prompt_job = threading.Thread(
+                        target=self.state.assistant.update_system_prompt,
+                        args=(user_input,), daemon=True
+                    )
+                    prompt_job.start()
                     ctx = self.state.assistant.decide_and_search(
                         user_input, skip_llm=skip_search
                     )
-
-                    self.state.assistant.update_system_prompt(user_input)
+                    prompt_job.join()
                     msgs = self._get_assistant_msgs(user_input, ctx)
                     self._run_streaming_chat(user_input, complexity, msgs)
                 finally:
@@ -539,7 +568,7 @@ class AssistantApp:
 
     def _cmd_clear(self, _):
         if self.state.assistant:
-            self.state.assistant.messages = []
+            self.state.assistant.messages.clear()
             self.markdown_engine.clear()
             info_print("Conversation history cleared.")
             self.state.msg_queue.put(("clear", None, None))
@@ -590,79 +619,16 @@ class AssistantApp:
             self.state.msg_queue.put(("enable", None, None))
             return
 
-        self._build_model_sidebar(models)
-
-    def _build_model_sidebar(self, models):
-        """Constructs the model selection UI components."""
-        for widget in self.ui.sidebar.frame.winfo_children():
-            widget.destroy()
-
         self.state.ui_state.sidebar_visible = True
-        self.ui.sidebar.frame.grid()
-
-        header = tk.Frame(self.ui.sidebar.frame, bg=Theme.BG_COLOR)
-        header.pack(fill="x", padx=10, pady=(5, 0))
-        header.grid_columnconfigure(0, weight=1)
-
-        tk.Label(header, text="Models", font=self.fonts["h3"],
-                 bg=Theme.BG_COLOR, fg=Theme.FG_COLOR).grid(row=0, column=0)
-
-        tk.Button(header, text="<", command=self._close_sidebar, font=("Roboto", 24),
-                  bg=Theme.BG_COLOR, fg=Theme.SYSTEM_COLOR, borderwidth=0,
-                  highlightthickness=0, activebackground=Theme.BG_COLOR,
-                  activeforeground=Theme.FG_COLOR, cursor="hand2").grid(row=0, column=0, sticky="w")
-
-        self.ui.sidebar.canvas = tk.Canvas(
-            self.ui.sidebar.frame, bg=Theme.BG_COLOR, highlightthickness=0
+        build_model_sidebar(
+            self.ui.sidebar, self.fonts, models, self._on_model_selected, self._close_sidebar
         )
-        self.ui.sidebar.canvas.pack(fill="both", expand=True, padx=10, pady=(2, 0))
 
-        self.ui.sidebar.bg_id = round_rectangle(
-            self.ui.sidebar.canvas, (4, 4, 10, 10), radius=25,
-            outline=Theme.ACCENT_COLOR, width=6, fill=Theme.INPUT_BG
-        )
-
-        inner = tk.Frame(self.ui.sidebar.canvas, bg=Theme.INPUT_BG)
-        self.ui.sidebar.window_id = self.ui.sidebar.canvas.create_window(
-            12, 12, anchor="nw", window=inner
-        )
-
-        self._create_model_listbox(inner, models)
-        self.ui.sidebar.canvas.bind("<Configure>", self._on_sidebar_canvas_configure)
-
-    def _create_model_listbox(self, parent, models):
-        """Creates and populates the model listbox."""
-        listbox = tk.Listbox(
-            parent, font=self.fonts["base"], bg=Theme.INPUT_BG,
-            fg=Theme.FG_COLOR, selectbackground=Theme.USER_COLOR,
-            selectforeground=Theme.BG_COLOR, borderwidth=0,
-            highlightthickness=0, activestyle='none', width=25
-        )
-        listbox.pack(side="left", fill="both", expand=True)
-
-        scrollbar = CustomScrollbar(parent, command=listbox.yview, bg=Theme.INPUT_BG)
-        scrollbar.pack(side="right", fill="y")
-        listbox.config(yscrollcommand=scrollbar.set)
-
-        curr = config.MODEL_NAME
-        for i, model in enumerate(models):
-            display_name = f"{model} (Current)" if model == curr else model
-            listbox.insert(tk.END, display_name)
-            if model == curr:
-                listbox.selection_set(i)
-                listbox.see(i)
-
-        def _confirm(_=None):
-            selection = listbox.curselection()
-            if selection:
-                new_model = models[selection[0]]
-                if new_model != config.MODEL_NAME:
-                    self._switch_model_logic(new_model)
-            self._close_sidebar()
-
-        listbox.bind("<Return>", _confirm)
-        listbox.bind("<Double-Button-1>", _confirm)
-        listbox.focus_set()
+    def _on_model_selected(self, new_model):
+        """Switches to the model picked in the sidebar, then closes it."""
+        if new_model and new_model != config.MODEL_NAME:
+            self._switch_model_logic(new_model)
+        self._close_sidebar()
 
     def _switch_model_logic(self, new_model):
         """Handles the actual model switching process."""
@@ -694,17 +660,21 @@ class AssistantApp:
 
             def run_bypass():
                 try:
-                    run_ollama_bypass(
+                    _, proc = run_ollama_bypass(
                         raw, self.state.msg_queue,
-                        lambda: self.state.process.stop_generation,
+                        self.state.process.stop_generation.is_set,
                         start_callback=_assign_proc
                     )
-                    msg = "[Interrupted]" if self.state.process.stop_generation else "\n"
-                    tag = "cancelled" if self.state.process.stop_generation else "assistant"
+                    stopped = self.state.process.stop_generation.is_set()
+                    msg = "[Interrupted]" if stopped else "\n"
+                    tag = "cancelled" if stopped else "assistant"
                     self.state.msg_queue.put(("text", msg, tag))
-                    if not self.state.process.stop_generation:
+                    if not stopped:
                         self.state.msg_queue.put(("final_render", "", "assistant"))
                     self._stop_active_process()
+                    if proc is not None:
+                        # Reaped here, off the Tk thread, whichever path signalled it
+                        reap_process(proc)
                 finally:
                     self.state.msg_queue.put(("enable", None, None))
 
@@ -712,223 +682,249 @@ class AssistantApp:
 
     def _replace_last_message(self, text, tag):
         """Replaces the last message in the chat."""
-        self.ui.chat.display.config(state='normal')
+        display = self.ui.chat.display
         try:
-            self.ui.chat.display.delete("end-1c linestart", "end-1c")
-            self.ui.chat.display.insert("end-1c", text, tag)
-            if self.state.auto_scroll:
-                self.ui.chat.display.see(tk.END)
+            display.delete("end-1c linestart", "end-1c")
+            display.insert("end-1c", text, tag)
         except tk.TclError:
             pass
-        finally:
-            self.ui.chat.display.config(state='disabled')
 
     def _render_assistant_stream(self, text, final):
-        """Helper to render assistant text stream with markdown."""
+        """
+        Renders the streamed assistant reply with markdown. Completed blocks are
+        rendered once and kept; only the still-open trailing block is redrawn.
+        The caller closes the turn after a final render.
+        """
+        resp = self.state.response
+        display = self.ui.chat.display
         if not final:
-            self.state.response.full_text += text
-        if "\n" in text or final:
-            cur = self.state.response.full_text.strip()
-            if len(cur) > self.state.response.last_rendered_len or final:
-                self.ui.chat.display.delete("assistant_msg_start", tk.END)
-
-                # Ensure we are still on a new line after deletion
-                if self.ui.chat.display.index("assistant_msg_start") != "1.0":
-                    if self.ui.chat.display.get("assistant_msg_start - 1 chars") != "\n":
-                        self.ui.chat.display.mark_gravity("assistant_msg_start", tk.RIGHT)
-                        self.ui.chat.display.insert("assistant_msg_start", "\n")
-                        self.ui.chat.display.mark_gravity("assistant_msg_start", tk.LEFT)
-
-                if self.state.indicator.active:
-                    self.ui.chat.display.insert(
-                        "assistant_msg_start", f"{self.state.indicator.char} ", "indicator"
-                    )
-                try:
-                    toks = self.md_parser(cur)
-                    self.markdown_engine.render_tokens(toks, "assistant")
-                    self.state.response.last_rendered_len = len(cur)
-                except (ValueError, TypeError):
-                    self.ui.chat.display.insert(
-                        "end-1c", self.state.response.full_text, "assistant"
-                    )
-            if final:
-                self._finalize_message_turn()
+            resp.append(text)
+        if "\n" not in text and not final:
+            display.insert("end-1c", text, "assistant")
+            return
+        full = resp.full_text
+        if len(full.rstrip()) <= resp.last_rendered_len and not final:
+            return
+
+        if resp.stable_offset == 0:
+            self._reset_stream_region()
+            resp.stable_offset = len(full) - len(full.lstrip())
         else:
-            self.ui.chat.display.insert("end-1c", text, "assistant")
+            display.delete("assistant_stable_end", tk.END)
+            if final and "indicator" in display.tag_names("assistant_msg_start"):
+                display.delete("assistant_msg_start", "assistant_msg_start + 2 chars")
+
+        tail = full[resp.stable_offset:]
+        split = 0 if final else find_stable_boundary(tail)
+        try:
+            if split:
+                self.markdown_engine.render_tokens(self.md_parser(tail[:split]), "assistant")
+                display.mark_set("assistant_stable_end", "end-1c")
+                resp.stable_offset += split
+            self.markdown_engine.render_tokens(
+                self.md_parser(tail[split:].rstrip()), "assistant"
+            )
+            resp.last_rendered_len = len(full.rstrip())
+        except (ValueError, TypeError):
+            display.insert("end-1c", tail[split:], "assistant")
+
+    def _reset_stream_region(self):
+        """Clears the response region, leaving only the indicator, if active."""
+        display = self.ui.chat.display
+        display.delete("assistant_msg_start", tk.END)
+
+        # Ensure we are still on a new line after deletion
+        if display.index("assistant_msg_start") != "1.0":
+            if display.get("assistant_msg_start - 1 chars") != "\n":
+                display.mark_gravity("assistant_msg_start", tk.RIGHT)
+                display.insert("assistant_msg_start", "\n")
+                display.mark_gravity("assistant_msg_start", tk.LEFT)
+
+        if self.state.indicator.active:
+            self._insert_indicator(display)
+        display.mark_set("assistant_stable_end", "end-1c")
 
     def _display_message(self, text, tag, final=False):
-        """Renders messages in the chat display with Markdown support."""
-        self.ui.chat.display.config(state='normal')
+        """
+        Renders messages in the chat display with Markdown support.
+        Expects the display to be editable; the queue drain toggles its state.
+        """
+        display = self.ui.chat.display
+        resp = self.state.response
         try:
             if tag == "cancelled":
-                self.ui.chat.display.delete("assistant_msg_start", tk.END)
-                try:
-                    toks = self.md_parser(self.state.response.full_text.strip())
-                    self.markdown_engine.render_tokens(toks, "assistant")
-                except (ValueError, TypeError):
-                    self.ui.chat.display.insert(
-                        "end-1c", self.state.response.full_text, "assistant"
-                    )
-                self.ui.chat.display.insert("end-1c", text, "cancelled")
+                # Completed blocks stay as rendered; only the open tail is redrawn
+                self._render_assistant_stream("", True)
+                display.insert("end-1c", text, "cancelled")
                 self._finalize_message_turn()
             elif tag == "assistant":
                 self._render_assistant_stream(text, final)
+                if final:
+                    self._finalize_message_turn()
             else:
                 if self.state.indicator.active and tag in ("system", "error"):
                     # Insert before the indicator/response region to avoid interference
                     if not text.endswith("\n"):
                         text += "\n"
-                    self.ui.chat.display.mark_gravity("assistant_msg_start", tk.RIGHT)
-                    self.ui.chat.display.insert("assistant_msg_start", text, tag)
-                    self.ui.chat.display.mark_gravity("assistant_msg_start", tk.LEFT)
+                    display.mark_gravity("assistant_msg_start", tk.RIGHT)
+                    display.insert("assistant_msg_start", text, tag)
+                    display.mark_gravity("assistant_msg_start", tk.LEFT)
                 else:
-                    self.ui.chat.display.insert("end-1c", text, tag)
-                self.state.response.full_text = ""
-                self.state.response.last_rendered_len = 0
+                    display.insert("end-1c", text, tag)
+                resp.reset()
                 if tag == "user":
                     self._finalize_message_turn()
         except (tk.TclError, ValueError) as exc:
-            self.ui.chat.display.insert("end-1c", f"\n[GUI Error: {exc}]\n", "error")
-        finally:
-            if self.state.auto_scroll:
-                self.ui.chat.display.see(tk.END)
-            self.ui.chat.display.config(state='disabled')
+            display.insert("end-1c", f"\n[GUI Error: {exc}]\n", "error")
 
     def _finalize_message_turn(self):
         """Handles post-message-turn cleanup and UI elements."""
+        display = self.ui.chat.display
         try:
             # Only delete the trailing newline if it's strictly AFTER the assistant_msg_start mark.
             # This prevents merging lines if the response is empty.
-            if self.ui.chat.display.compare("end-2c", ">", "assistant_msg_start"):
-                if self.ui.chat.display.get("end-2c", "end-1c") == "\n":
-                    self.ui.chat.display.delete("end-2c", "end-1c")
-            self._insert_separator(height=40)
-            self.ui.chat.display.mark_set("assistant_msg_start", "end-1c")
-            self.state.response.full_text = ""
+            if display.compare("end-2c", ">", "assistant_msg_start"):
+                if display.get("end-2c", "end-1c") == "\n":
+                    display.delete("end-2c", "end-1c")
+            self._insert_separator()
+            display.mark_set("assistant_msg_start", "end-1c")
+            self.state.response.reset()
+            trim_chat_history(display, config.MAX_CHAT_LINES, self.markdown_engine.url_map)
         except tk.TclError:
             pass
 
-    def _insert_separator(self, height=25):
-        """Inserts a thematic separator in the chat."""
-        try:
-            # Ensure separator starts on a new line
-            if self.ui.chat.display.index("end-1c") != "1.0":
-                if self.ui.chat.display.get("end-2c", "end-1c") != "\n":
-                    self.ui.chat.display.insert("end-1c", "\n")
-
-            w = max(600, self.ui.chat.display.winfo_width() - 40)
-            canv = tk.Canvas(self.ui.chat.display, bg=Theme.BG_COLOR, height=height,
-                             highlightthickness=0, width=w)
-            canv.create_line(10, height//2, w-10, height//2, fill=Theme.SEPARATOR_COLOR)
-
-            def _on_mousewheel(event):
-                self.ui.chat.display.yview_scroll(int(-1*(event.delta/120)), "units")
-            def _on_linux_up(_):
-                self.ui.chat.display.yview_scroll(-1, "units")
-            def _on_linux_down(_):
-                self.ui.chat.display.yview_scroll(1, "units")
-
-            canv.bind("<MouseWheel>", _on_mousewheel)
-            canv.bind("<Button-4>", _on_linux_up)
-            canv.bind("<Button-5>", _on_linux_down)
-
-            self.ui.chat.display.window_create("end-1c", window=canv)
-            self.ui.chat.display.insert("end-1c", "\n")
-        except tk.TclError:
-            self.ui.chat.display.insert("end-1c", "-"*20 + "\n")
+    def _insert_separator(self):
+        """Inserts a thematic separator line in the chat."""
+        display = self.ui.chat.display
+        # Ensure separator starts on a new line
+        if display.index("end-1c") != "1.0" and display.get("end-2c", "end-1c") != "\n":
+            display.insert("end-1c", "\n")
+        # Only newlines: the rule follows the display width and copies as blank lines
+        display.insert(
+            "end-1c", "\n", "separator", "\n", ("separator", "separator_rule"), "\n", "separator"
+        )
 
     def _handle_tooltip(self, _, url):
         """Displays a tooltip for links."""
         if not url:
-            if self.ui.tooltip_window:
-                try:
-                    self.ui.tooltip_window.destroy()
-                except tk.TclError:
-                    pass
-                self.ui.tooltip_window = None
-            return
-        if self.ui.tooltip_window:
-            return
-        try:
-            xp, yp = self.root.winfo_pointerx() + 15, self.root.winfo_pointery() + 15
-            self.ui.tooltip_window = win = tk.Toplevel(self.root)
-            win.wm_overrideredirect(True)
-            win.wm_geometry(f"+{xp}+{yp}")
-            tk.Label(win, text=f"Ctrl + Click to open {url}",
-                     background=Theme.TOOLTIP_BG, foreground=Theme.FG_COLOR,
-                     relief='solid', borderwidth=1, font=self.fonts["tooltip"],
-                     padx=5, pady=2).pack()
-        except tk.TclError:
-            self.ui.tooltip_window = None
+            self.ui.tooltip.hide()
+        else:
+            self.ui.tooltip.show(f"Ctrl + Click to open {url}")
 
-    def _check_queue(self):
-        """Polls the message queue for UI updates."""
+    def _wake_queue(self):
+        """Schedules a queue drain on the Tk thread; safe to call from workers."""
+        wait = config.UI_FRAME_INTERVAL - (time.monotonic() - self.state.msg_queue.last_drain)
         try:
-            while not self.state.msg_queue.empty():
-                action, content, tag = self.state.msg_queue.get_nowait()
-                self._dispatch_queue_action(action, content, tag)
-        except queue.Empty:
-            pass
-        except (tk.TclError, ValueError) as exc:
-            debug_print(f"Error processing queue: {exc}")
-        finally:
-            self.root.after(30, self._check_queue)
+            if wait > 0:
+                # Drained within the current frame; hold further output until the next
+                self.root.after(int(wait * 1000) + 1, self._drain_queue)
+            else:
+                self.root.after_idle(self._drain_queue)
+        except (RuntimeError, tk.TclError):
+            # Main loop not running yet (or shutting down); the startup drain
+            # scheduled in __init__ picks these items up once it starts
+            self.state.msg_queue.wake_pending = False
+
+    def _drain_queue(self):
+        """Applies pending UI updates in bounded batches."""
+        self.state.msg_queue.wake_pending = False
+        self.state.msg_queue.last_drain = time.monotonic()
+        batch = self.state.msg_queue.drain(config.MAX_QUEUE_ITEMS_PER_TICK)
+        if not batch:
+            return
+        if len(batch) == config.MAX_QUEUE_ITEMS_PER_TICK:
+            # More may be waiting; continue after Tk has handled other events
+            self.state.msg_queue.wake_pending = True
+            self.root.after(0, self._drain_queue)
+
+        # Resolve the handler table once per batch rather than per item
+        handler_for = self._queue_actions.get
+        actions = coalesce_text_actions(batch, COALESCED_TEXT_TAGS)
+        with editable(self.ui.chat.display) as display:
+            for done, (action, content, tag) in enumerate(actions, 1):
+                handler = handler_for(action)
+                if handler is None:
+                    continue
+                # A failing action is logged and skipped; the rest of the batch still applies
+                try:
+                    handler(content, tag)
+                except (tk.TclError, ValueError) as exc:
+                    debug_print(f"Error processing queue: {exc}")
+                except BaseException:
+                    # Unexpected errors reach report_callback_exception, but the
+                    # rest of the batch (e.g. an "enable") must not be lost with them
+                    self.state.msg_queue.requeue(actions[done:])
+                    raise
+            if self.state.auto_scroll:
+                display.see(tk.END)
 
-    def _dispatch_queue_action(self, action, content, tag):
-        """Dispatcher for UI actions from the message queue."""
-        if action == "text":
-            if tag == "cancelled":
-                self.state.indicator.active = False
-            self._display_message(content, tag)
-        elif action == "start_indicator":
-            self._start_indicator()
-        elif action == "replace_last":
-            self._replace_last_message(content, tag)
-        elif action == "clear":
-            self.ui.chat.display.config(state='normal')
-            self.ui.chat.display.delete("1.0", tk.END)
-            self.ui.chat.display.config(state='disabled')
-            self._display_message("Type /help for commands.\n\n", "system")
-        elif action == "separator":
-            self.ui.chat.display.config(state='normal')
-            self._insert_separator(height=40)
-            self.ui.chat.display.config(state='disabled')
-        elif action == "final_render":
+    @functools.cached_property
+    def _queue_actions(self):
+        """Binds QUEUE_ACTION_HANDLERS to this app once, on first use."""
+        return {action: getattr(self, name) for action, name in QUEUE_ACTION_HANDLERS.items()}
+
+    def _on_text_action(self, content, tag):
+        if tag == "cancelled":
             self.state.indicator.active = False
-            self._display_message("", tag, final=True)
-            self._update_info_display()
-        elif action == "toggle_info":
-            self.state.ui_state.show_info = self.ui.info_panel.toggle()
-            self.settings.set("show_info", self.state.ui_state.show_info)
-            self._update_info_display()
-        elif action == "update_info_ui":
-            self.ui.info_panel.update_stats(content)
-        elif action == "enable":
-            self.state.process.is_busy = False
-            self.ui.input.field.focus_set()
-            self._adjust_input_height()
-        elif action == "quit":
-            self.root.quit()
+        self._display_message(content, tag)
+
+    def _on_start_indicator_action(self, _content, _tag):
+        self._start_indicator()
+
+    def _on_clear_action(self, _content, _tag):
+        self.ui.chat.display.delete("1.0", tk.END)
+        self._display_message("Type /help for commands.\n\n", "system")
+
+    def _on_separator_action(self, _content, _tag):
+        self._insert_separator()
+
+    def _on_final_render_action(self, _content, tag):
+        self.state.indicator.active = False
+        self._display_message("", tag, final=True)
+        self._update_info_display()
+
+    def _on_toggle_info_action(self, _content, _tag):
+        self.state.ui_state.show_info = self.ui.info_panel.toggle()
+        self.settings.set("show_info", self.state.ui_state.show_info)
+        self._update_info_display()
+
+    def _on_update_info_action(self, content, _tag):
+        self.ui.info_panel.update_stats(content)
+
+    def _on_enable_action(self, _content, _tag):
+        self.state.process.is_busy = False
+        self.ui.input.field.focus_set()
+        self._adjust_input_height()
+
+    def _on_set_parser_action(self, content, _tag):
+        self.md_parser = content
+
+    def _on_quit_action(self, _content, _tag):
+        self.root.quit()
 
     def _update_info_display(self):
         """Fetches and displays model info in the info panel."""
-        if not self.state.ui_state.show_info or not self.state.assistant:
+        if not self.state.ui_state.show_info:
+            # A refresh queued before the panel was hidden is no longer needed
+            self.state.process.info_worker.cancel()
             return
+        if self.state.assistant:
+            self.state.process.info_worker.request()
 
-        def _fetch():
-            try:
-                info = self.state.assistant.get_model_info()
-                self.state.msg_queue.put(("update_info_ui", info, None))
-            except ConnectionError:
-                # Silently ignore connection errors during background stats refresh
-                pass
-
-        threading.Thread(target=_fetch, daemon=True).start()
+    def _fetch_info(self):
+        """Runs on the info worker thread and queues the latest model info."""
+        try:
+            info = self.state.assistant.get_model_info()
+            self.state.msg_queue.put(("update_info_ui", info, None))
+        except ConnectionError:
+            # Silently ignore connection errors during background stats refresh
+            pass
 
     def _cancel_generation(self, _=None):
-        """Cancels any ongoing model generation."""
-        if self.state.process.is_busy:
-            self.state.process.stop_generation = True
+        """Cancels any ongoing model generation; auto-repeated keys are ignored."""
+        stop = self.state.process.stop_generation
+        if self.state.process.is_busy and not stop.is_set():
+            stop.set()
             self._stop_active_process()
 
     def _on_close(self):
@@ -941,25 +937,26 @@ class AssistantApp:
         if not self.state.indicator.active:
             self.state.indicator.active = True
             self.state.indicator.char = config.INDICATOR_CHARS[0]
-            self.ui.chat.display.config(state='normal')
+            display = self.ui.chat.display
             try:
                 # Ensure we start on a new line
-                if self.ui.chat.display.index("end-1c") != "1.0":
-                    if self.ui.chat.display.get("end-2c", "end-1c") != "\n":
-                        self.ui.chat.display.insert("end-1c", "\n")
+                if display.index("end-1c") != "1.0":
+                    if display.get("end-2c", "end-1c") != "\n":
+                        display.insert("end-1c", "\n")
 
                 # Move mark to current end to isolate from previous logs
-                self.ui.chat.display.mark_set("assistant_msg_start", "end-1c")
-
-                self.ui.chat.display.insert(
-                    "assistant_msg_start", f"{self.state.indicator.char} ", "indicator"
-                )
+                display.mark_set("assistant_msg_start", "end-1c")
+                self._insert_indicator(display)
             except tk.TclError:
                 pass
-            finally:
-                self.ui.chat.display.config(state='disabled')
             self._toggle_indicator()
 
+    def _insert_indicator(self, display):
+        """Inserts the indicator at the message start and marks the end of its symbol."""
+        display.insert("assistant_msg_start", f"{self.state.indicator.char} ", "indicator")
+        # New marks have right gravity, so the mark stays after each swapped-in symbol
+        display.mark_set("indicator_end", "assistant_msg_start + 1 chars")
+
     def _toggle_indicator(self):
         """Alternates the indicator symbol every second."""
         if not self.state.indicator.active:
@@ -968,28 +965,27 @@ class AssistantApp:
         chars = config.INDICATOR_CHARS
         try:
             idx = chars.index(self.state.indicator.char)
-            self.state.indicator.char = chars[(idx + 1) % len(chars)]
+            new_char = chars[(idx + 1) % len(chars)]
         except ValueError:
-            self.state.indicator.char = chars[0]
+            new_char = chars[0]
 
-        self._update_indicator_ui()
+        # A one-symbol set (or a reset onto the same symbol) needs no redraw
+        if new_char != self.state.indicator.char:
+            self.state.indicator.char = new_char
+            self._update_indicator_ui()
         self.root.after(700, self._toggle_indicator)
 
     def _update_indicator_ui(self):
         """Updates the indicator symbol in the chat display."""
         if not self.state.indicator.active:
             return
-        self.ui.chat.display.config(state='normal')
-        try:
-            # Replace only the symbol character, preserving the trailing space
-            self.ui.chat.display.delete("assistant_msg_start", "assistant_msg_start + 1 chars")
-            self.ui.chat.display.insert(
-                "assistant_msg_start", self.state.indicator.char, "indicator"
-            )
-        except tk.TclError:
-            pass
-        finally:
-            self.ui.chat.display.config(state='disabled')
+        with editable(self.ui.chat.display) as display:
+            try:
+                # Replace only the symbol character, preserving the trailing space
+                display.delete("assistant_msg_start", "indicator_end")
+                display.insert("assistant_msg_start", self.state.indicator.char, "indicator")
+            except tk.TclError:
+                pass
 
 if __name__ == "__main__":
     root_win = tk.Tk()
@@ -1,12 +1,13 @@
 """
 Data structures and state management for the Lokality application.
 """
-import queue
+import threading
 import tkinter as tk
+from collections import deque
 from dataclasses import dataclass, field
 from typing import Optional, Any
 import config
-from ui_components import CustomScrollbar, InfoPanel
+from ui_components import CustomScrollbar, InfoPanel, Tooltip
 
 @dataclass
 class IndicatorState:
@@ -16,22 +17,92 @@ class IndicatorState:
 
 @dataclass
 class ResponseState:
-    """Holds the current response state."""
-    full_text: str = ""
+    """
+    Holds the current response state. Streamed chunks are collected in a list
+    and only joined when the text is read, so chunks arriving between renders
+    do not each copy the whole reply.
+    """
+    parts: list = field(default_factory=list)
     last_rendered_len: int = 0
+    stable_offset: int = 0
+
+    @property
+    def full_text(self):
+        """The reply streamed so far."""
+        if len(self.parts) > 1:
+            self.parts[:] = ["".join(self.parts)]
+        return self.parts[0] if self.parts else ""
+
+    def append(self, text):
+        """Adds a streamed chunk to the reply."""
+        self.parts.append(text)
+
+    def reset(self):
+        """Starts a new, empty reply."""
+        self.parts.clear()
+        self.last_rendered_len = 0
+        self.stable_offset = 0
+
+class MessageQueue:
+    """
+    FIFO carrying UI actions from worker threads to the Tk main thread.
+    Backed by a deque, whose append/popleft are atomic (also on free-threaded
+    builds), so no lock or condition variable is touched per item; only the Tk
+    thread drains it. Invokes the wake
+    callback on put so the consumer drains promptly instead of polling; repeated
+    puts before the next drain wake it only once.
+    """
+    def __init__(self):
+        self._items = deque()
+        self.wake = lambda: None
+        self.wake_pending = False
+        self.last_drain = 0.0
+
+    def put(self, item):
+        """Enqueues an item and wakes the consumer if it is not already due."""
+        self._items.append(item)
+        if not self.wake_pending:
+            self.wake_pending = True
+            self.wake()
+
+    def requeue(self, items):
+        """
+        Puts drained items back at the head of the queue in their original
+        order and wakes the consumer. Must only be called by the consumer.
+        """
+        self._items.extendleft(reversed(items))
+        if items and not self.wake_pending:
+            self.wake_pending = True
+            self.wake()
+
+    def drain(self, limit=None):
+        """
+        Removes and returns up to limit queued items (all if None) in FIFO order.
+        Must only be called by the consumer.
+        """
+        items = []
+        pop = self._items.popleft
+        try:
+            while limit is None or len(items) < limit:
+                items.append(pop())
+        except IndexError:
+            pass
+        return items
 
 @dataclass
 class ProcessState:
     """Holds the model process state."""
     active: Optional[Any] = None
     is_busy: bool = False
-    stop_generation: bool = False
+    stop_generation: threading.Event = field(default_factory=threading.Event)
+    info_worker: Optional[Any] = None
 
 @dataclass
 class UIState:
     """Holds UI visibility state."""
     show_info: bool = False
     sidebar_visible: bool = False
+    jump_btn_visible: bool = False
 
 @dataclass
 class AppState:
@@ -41,7 +112,7 @@ class AppState:
     auto_scroll: bool = True
     response: ResponseState = field(default_factory=ResponseState)
     ui_state: UIState = field(default_factory=UIState)
-    msg_queue: queue.Queue = field(default_factory=queue.Queue)
+    msg_queue: MessageQueue = field(default_factory=MessageQueue)
     indicator: IndicatorState = field(default_factory=IndicatorState)
 
 @dataclass
@@ -63,6 +134,8 @@ class InputUI:
     inner: Optional[tk.Frame] = None
     window_id: Optional[int] = None
     field: Optional[tk.Text] = None
+    line_h: int = 0
+    height: int = 0
 
 @dataclass
 class SidebarUI:
@@ -79,7 +152,9 @@ class AppUI:
     input: InputUI = field(default_factory=InputUI)
     info_panel: Optional[InfoPanel] = None
     sidebar: SidebarUI = field(default_factory=SidebarUI)
-    tooltip_window: Optional[tk.Toplevel] = None
+    tooltip: Optional[Tooltip] = None
+    debounce_jobs: dict = field(default_factory=dict)
+    sizes: dict = field(default_factory=dict)
 
 @dataclass
 class CanvasConfig:
@@ -102,3 +177,7 @@ SLASH_COMMANDS = [
     ["/model", "Switch the current Ollama model"],
     ["/exit", "Exit the application"]
 ]
+
+# Lookup structures for per-keystroke highlighting and tab completion
+SLASH_COMMAND_NAMES = tuple(sorted(cmd for cmd, _ in SLASH_COMMANDS))
+SLASH_COMMAND_SET = frozenset(SLASH_COMMAND_NAMES)
@@ -16,6 +16,28 @@ DEFAULT_MODELS = [
 ]
 
 # Model performance tuning
+# Streamed tokens are batched before reaching the UI; a batch is flushed on a
+# newline, once it reaches STREAM_FLUSH_CHARS, or after STREAM_FLUSH_INTERVAL seconds
+STREAM_FLUSH_CHARS = 64
+STREAM_FLUSH_INTERVAL = 0.03
+
+# Queue items applied per Tk callback; a larger backlog continues on the next tick
+# so a burst of output cannot block input handling and redraws
+MAX_QUEUE_ITEMS_PER_TICK = 128
+# Minimum spacing between queue drains (seconds), capping UI updates at ~60 Hz
+UI_FRAME_INTERVAL = 1 / 60
+
+# Short-term conversation history kept for context (user + assistant messages)
+MAX_HISTORY_MESSAGES = 20
+
+# Lines kept in the chat display; older turns are dropped once it grows past this
+MAX_CHAT_LINES = 5000
+
+# Border redraws during a window resize are deferred until events settle (ms)
+RESIZE_DEBOUNCE_MS = 16
+
+# Command highlighting and input resizing wait for a typing burst to pause (ms)
+KEY_RELEASE_DEBOUNCE_MS = 30
 
 # This can be toggled at runtime via /debug
 DEBUG = os.environ.get("DEBUG", "0") == "1"
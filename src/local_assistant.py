@@ -2,6 +2,7 @@
 Core conversation logic for Lokality.
 Manages LLM interaction, search decisions, and memory updates.
 """
+from collections import deque
 from datetime import datetime
 import json
 import re
@@ -52,7 +53,7 @@ class LocalChatAssistant:
     Manages conversation state and coordinates assistant capabilities.
     """
     def __init__(self):
-        self.messages = []
+        self.messages = deque(maxlen=config.MAX_HISTORY_MESSAGES)
         self.memory = MemoryStore()
         self.system_prompt = ""
         self._cached_prompt = None
@@ -238,12 +239,16 @@ class LocalChatAssistant:
             return True
         return False
 
+    def _recent_context(self):
+        """Summarizes the last exchange for search prompts."""
+        return "\n".join(
+            f"{m['role']}: {m['content'][:150]}" for m in list(self.messages)[-2:]
+        )
+
     def _get_search_decision(self, user_input):
         """Asks the model if a web search is needed."""
         now = datetime.now()
-        recent_context = "\n".join(
-            [f"{m['role']}: {m['content'][:150]}" for m in self.messages[-2:]]
-        )
+        recent_context = self._recent_context()
         decision_prompt = (
             f"Date: {now.strftime('%Y-%m-%d')}, Time: {now.strftime('%H:%M:%S')}\n"
             f"Memory: {self.memory.get_relevant_facts(user_input)}\n"
@@ -334,9 +339,7 @@ class LocalChatAssistant:
             return self._session_search_cache[query]
 
         results = SearchEngine.web_search(query)
-        recent_context = "\n".join(
-            [f"{m['role']}: {m['content'][:150]}" for m in self.messages[-2:]]
-        )
+        recent_context = self._recent_context()
         try:
             extra = self._handle_scraping(user_input, results, recent_context)
             results += extra
@@ -355,8 +358,10 @@ class LocalChatAssistant:
 
     def get_model_info(self):
         """Returns current model and system usage stats."""
+        # Runs on the info worker; a snapshot keeps a concurrent extend() or
+        # clear() from raising "deque mutated during iteration"
         return get_model_info(
-            self.memory, self.system_prompt, self.messages
+            self.memory, self.system_prompt, list(self.messages)
         )
 
     def get_available_models(self):
@@ -374,6 +379,6 @@ class LocalChatAssistant:
         """Switches the current model and clears short-term memory."""
         info_print(f"[*] Switching model to: {new_model_name}")
         config.MODEL_NAME = new_model_name
-        self.messages = []  # Clear short-term memory as requested
+        self.messages.clear()  # Clear short-term memory as requested
         self._wake_model()
         return True
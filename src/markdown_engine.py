@@ -2,11 +2,75 @@
 Markdown rendering engine for Lokality.
 Converts Markdown tokens into Tkinter text widget elements.
 """
+import functools
+import re
 import tkinter as tk
 import webbrowser
 from utils import debug_print
 import theme as Theme
 
+FENCE_MARKERS = ("```", "~~~")
+# Lines that may continue the block above a blank line (lists, quotes, tables, indents)
+CONTINUATION_LINE = re.compile(r'\s|[-*+>|]|\d+[.)]')
+
+# mistune token type -> name of the MarkdownEngine method rendering it
+TOKEN_HANDLERS = {
+    'paragraph': '_handle_paragraph',
+    'block_text': '_handle_block_text',
+    'text': '_handle_text',
+    'strong': '_handle_strong',
+    'emphasis': '_handle_emphasis',
+    'subscript': '_handle_subscript',
+    'superscript': '_handle_superscript',
+    'strikethrough': '_handle_strikethrough',
+    'codespan': '_handle_codespan',
+    'block_code': '_handle_block_code',
+    'heading': '_handle_heading',
+    'table': '_handle_table',
+    'list': '_handle_list',
+    'block_quote': '_handle_block_quote',
+    'thematic_break': '_handle_thematic_break',
+    'softbreak': '_handle_softbreak',
+    'link': '_handle_link',
+}
+
+def create_markdown_parser():
+    """
+    Builds the mistune AST parser. mistune is imported here rather than at
+    module load so the window can appear before its plugins are initialized.
+    """
+    import mistune
+    from mistune.plugins import formatting
+    # Single-slot cache: the final render re-parses the same open tail
+    # as the last streaming flush whenever no new text arrived in between
+    return functools.lru_cache(maxsize=1)(mistune.create_markdown(
+        renderer=None,
+        plugins=['table', 'strikethrough', formatting.superscript, formatting.subscript]
+    ))
+
+def find_stable_boundary(text):
+    """
+    Returns the offset up to which the streamed text holds only completed blocks.
+    A block is complete once a blank line outside a code fence is followed by a
+    full line that cannot continue it, so everything before that line can be
+    parsed and rendered independently of what is still streaming in.
+    """
+    boundary = offset = 0
+    in_fence = after_blank = False
+    for line in text.splitlines(keepends=True):
+        stripped = line.strip()
+        starts_block = (
+            after_blank and line.endswith("\n") and stripped
+            and not CONTINUATION_LINE.match(line)
+        )
+        if starts_block:
+            boundary = offset
+        if stripped.startswith(FENCE_MARKERS):
+            in_fence = not in_fence
+        after_blank = not stripped and not in_fence
+        offset += len(line)
+    return boundary
+
 class MarkdownEngine:
     """
     Renders a stream of Markdown tokens into a Tkinter Text widget.
@@ -105,30 +169,14 @@ class MarkdownEngine:
 
     def _dispatch_token(self, token, base_tag, style_tags, level):
         """Dispatcher for different token types."""
-        t_type = token['type']
-
-        handlers = {
-            'paragraph': self._handle_paragraph,
-            'block_text': self._handle_block_text,
-            'text': self._handle_text,
-            'strong': self._handle_strong,
-            'emphasis': self._handle_emphasis,
-            'subscript': self._handle_subscript,
-            'superscript': self._handle_superscript,
-            'strikethrough': self._handle_strikethrough,
-            'codespan': self._handle_codespan,
-            'block_code': self._handle_block_code,
-            'heading': self._handle_heading,
-            'table': self._handle_table,
-            'list': self._handle_list,
-            'block_quote': self._handle_block_quote,
-            'thematic_break': self._handle_thematic_break,
-            'softbreak': self._handle_softbreak,
-            'link': self._handle_link
-        }
-
-        if t_type in handlers:
-            handlers[t_type](token, base_tag, style_tags, level)
+        handler = self._token_handlers.get(token['type'])
+        if handler:
+            handler(token, base_tag, style_tags, level)
+
+    @functools.cached_property
+    def _token_handlers(self):
+        """Binds TOKEN_HANDLERS to this engine once, on first use."""
+        return {t_type: getattr(self, name) for t_type, name in TOKEN_HANDLERS.items()}
 
     def _get_nested_tags(self, current_tags, new_style):
         """Helper to manage combined tags (e.g. Bold + Italic)."""
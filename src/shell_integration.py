@@ -92,6 +92,14 @@ def _start_ollama_process(slave):
         text=True, bufsize=0, env=new_env, close_fds=True
     )
 
+def reap_process(process, timeout=0.5):
+    """Waits briefly for a finished or terminated process, killing it if it lingers."""
+    try:
+        process.wait(timeout=timeout)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
 def run_ollama_bypass(prompt, msg_queue, stop_check_callback, start_callback=None):
     """Runs Ollama in bypass mode using a PTY for raw CLI interaction."""
     logger.info("Starting bypass mode for prompt: %s...", prompt[:50])
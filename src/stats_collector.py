@@ -2,6 +2,8 @@
 Statistics collection for Lokality.
 Monitors model resource usage and estimates context window consumption.
 """
+import functools
+
 import ollama
 
 import config
@@ -45,6 +47,20 @@ def _get_resource_usage(stats):
     except (AttributeError, ollama.ResponseError, ConnectionError):
         pass
 
+@functools.lru_cache(maxsize=8)
+def _get_context_length(model_name):
+    """
+    Returns the model's context window from Ollama show. It is fixed per model,
+    so it is cached instead of refetched on every stats refresh; failures raise
+    and are therefore not cached.
+    """
+    show_dict = get_ollama_client().show(model_name).model_dump()
+    model_info = show_dict.get('modelinfo', {})
+    for key, val in model_info.items():
+        if 'context_length' in key:
+            return val
+    return 8192 # Default fallback
+
 def get_model_info(memory_store, system_prompt, messages):
     """Gathers statistics about the model and system."""
     stats = {
@@ -59,14 +75,7 @@ def get_model_info(memory_store, system_prompt, messages):
         _get_resource_usage(stats)
 
         # Context estimation
-        show = get_ollama_client().show(config.MODEL_NAME)
-        show_dict = show.model_dump()
-        max_ctx = 8192 # Default fallback
-        model_info = show_dict.get('modelinfo', {})
-        for key, val in model_info.items():
-            if 'context_length' in key:
-                max_ctx = val
-                break
+        max_ctx = _get_context_length(config.MODEL_NAME)
 
         total_tokens = _estimate_tokens(system_prompt)
         for msg in messages:
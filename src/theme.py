@@ -49,5 +49,6 @@ def get_fonts():
         "h3": (base_family, 14, "bold"),
         "unit": (base_family, 9, "bold"),
         "tooltip": (base_family, 9),
-        "indicator": (base_family, 13)
+        "indicator": (base_family, 13),
+        "separator": (base_family, 1)
     }
@@ -4,7 +4,7 @@ Custom Tkinter UI components for Lokality.
 import tkinter as tk
 from dataclasses import dataclass
 from typing import Optional
-from utils import round_rectangle
+from utils import round_rectangle, rounded_coords
 
 class CustomScrollbar(tk.Frame):
     """
@@ -77,6 +77,7 @@ class InfoPanel(tk.Frame):
         self.fonts = fonts
         self.show_info = False
         self.labels = []
+        self._shown_data = None
         self.ui = InfoUI()
 
         self.ui.canvas = tk.Canvas(
@@ -136,13 +137,17 @@ class InfoPanel(tk.Frame):
             stats['vram_mb'], "MB"
         ) if stats['vram_mb'] > 0 else ("-", "")
 
-        data = [
+        data = (
             ("Model: ", stats['model'], ""),
             ("Remaining Context: ", f"{100-stats['context_pct']:.1f}", "%"),
             ("Long Term Memory: ", f"{stats['memory_entries']}", " rows"),
             ("RAM Usage: ", ram_v, ram_u),
             ("VRAM Usage: ", vram_v, vram_u)
-        ]
+        )
+        # Skip relabeling and relayout when the displayed text would not change
+        if data == self._shown_data:
+            return
+        self._shown_data = data
         for i, (name, val, unit) in enumerate(data):
             self.labels[i][1].config(text=name)
             self.labels[i][2].config(text=val)
@@ -186,11 +191,50 @@ class InfoPanel(tk.Frame):
         if abs(self.ui.canvas.winfo_height() - total_h) > 5:
             self.ui.canvas.config(height=total_h)
             self.update_idletasks()
-        self.ui.canvas.delete(self.ui.bg_id)
-        self.ui.bg_id = round_rectangle(
-            self.ui.canvas, (4, 4, width-4, total_h-4),
-            radius=15, fill=self.theme.BG_COLOR
+        self.ui.canvas.coords(
+            self.ui.bg_id, *rounded_coords((4, 4, width-4, total_h-4), radius=15)
         )
-        self.ui.canvas.tag_lower(self.ui.bg_id)
         self.ui.canvas.itemconfig(self.ui.window_id, width=max_w, height=y_pos)
         self.ui.canvas.coords(self.ui.window_id, 20, (total_h - y_pos) / 2)
+
+class Tooltip:
+    """
+    A borderless hover tooltip. The window is built on first use and is then
+    only relabelled, moved and withdrawn, never recreated per hover.
+    """
+    def __init__(self, root, theme, font):
+        self.root = root
+        self.style = {"background": theme.TOOLTIP_BG, "foreground": theme.FG_COLOR, "font": font}
+        self.win = None
+        self.label = None
+        self.visible = False
+
+    def show(self, text):
+        """Shows the tooltip near the pointer unless it is already showing."""
+        if self.visible:
+            return
+        try:
+            xp, yp = self.root.winfo_pointerx() + 15, self.root.winfo_pointery() + 15
+            if self.win is None:
+                self.win = tk.Toplevel(self.root)
+                self.win.wm_overrideredirect(True)
+                self.label = tk.Label(
+                    self.win, relief='solid', borderwidth=1, padx=5, pady=2, **self.style
+                )
+                self.label.pack()
+            self.label.config(text=text)
+            self.win.wm_geometry(f"+{xp}+{yp}")
+            self.win.deiconify()
+            self.visible = True
+        except tk.TclError:
+            pass
+
+    def hide(self):
+        """Withdraws the tooltip if it is showing."""
+        if not self.visible:
+            return
+        self.visible = False
+        try:
+            self.win.withdraw()
+        except tk.TclError:
+            pass
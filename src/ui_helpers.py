@@ -2,32 +2,231 @@
 GUI helper functions for Lokality.
 """
 import tkinter as tk
+from bisect import bisect_left
+from contextlib import contextmanager
+from itertools import groupby, islice
+import config
 import theme as Theme
 from app_state import CanvasConfig
-from utils import round_rectangle
+from ui_components import CustomScrollbar
+from utils import round_rectangle, rounded_coords
+
+INPUT_PAD_Y = 10
+INPUT_BORDER_PAD = 10
+INPUT_MAX_LINES = 8
 
 def update_canvas_region(cfg: CanvasConfig) -> int:
     """Unified helper to update rounded rectangles on resize."""
     w, h = cfg.size
-    outline, line_w, fill = cfg.style
     px, py = cfg.pad
-    cfg.canvas.delete(cfg.bg_id)
-    nbg = round_rectangle(cfg.canvas, (4, 4, w-4, h-4), radius=cfg.radius,
-                          outline=outline, width=line_w, fill=fill)
-    cfg.canvas.tag_lower(nbg)
+    nbg = cfg.bg_id
+    if nbg is None:
+        outline, line_w, fill = cfg.style
+        nbg = round_rectangle(cfg.canvas, (4, 4, w-4, h-4), radius=cfg.radius,
+                              outline=outline, width=line_w, fill=fill)
+        cfg.canvas.tag_lower(nbg)
+    else:
+        cfg.canvas.coords(nbg, *rounded_coords((4, 4, w-4, h-4), cfg.radius))
     cfg.canvas.itemconfig(cfg.win_id, width=max(1, w-(px*2)),
                           height=max(1, h-(py*2)))
     cfg.canvas.coords(cfg.win_id, px, py)
     return nbg
 
-def update_lower_border(ui_input, forced_h=None):
-    """Redraws the input area border."""
-    w = ui_input.canvas.winfo_width()
-    h = forced_h if forced_h is not None else ui_input.canvas.winfo_height()
+def configure_chat_tags(display, fonts):
+    """Sets up text tags for different message types in one Tcl round-trip."""
+    f = fonts
+    styles = {
+        "user": {"foreground": Theme.USER_COLOR, "font": f["bold"]},
+        "assistant": {"foreground": Theme.FG_COLOR, "font": f["base"]},
+        "indicator": {"foreground": Theme.INDICATOR_COLOR, "font": f["indicator"]},
+        "system": {"foreground": Theme.SYSTEM_COLOR, "font": f["small"], "tabs": ("240",)},
+        "error": {"foreground": Theme.ERROR_COLOR},
+        "cancelled": {"foreground": Theme.CANCELLED_COLOR, "font": f["bold"]},
+        # A separator is three near-zero-height lines, about 40px in all; the middle
+        # one's newline is painted, which Tk extends to the right margin at any width
+        "separator": {"font": f["separator"], "spacing1": 8, "spacing3": 9},
+        "separator_rule": {"background": Theme.SEPARATOR_COLOR, "spacing1": 0, "spacing3": 0,
+                           "lmargin1": 10, "rmargin": 10},
+        "md_bold": {"font": f["bold"]},
+        "md_italic": {"font": f["italic"]},
+        "md_bold_italic": {"font": f["bold_italic"]},
+        "md_sub": {"font": f["small_base"], "offset": -2},
+        "md_sup": {"font": f["small_base"], "offset": 4},
+        "md_strikethrough": {"overstrike": True},
+        "md_code": {"font": f["code"], "background": Theme.CODE_BG,
+                    "foreground": Theme.CODE_FG},
+        "md_h1": {"font": f["h1"], "spacing1": 10, "spacing3": 5},
+        "md_h2": {"font": f["h2"], "spacing1": 8, "spacing3": 4},
+        "md_h3": {"font": f["h3"], "spacing1": 6, "spacing3": 3},
+        "md_link": {"foreground": Theme.LINK_COLOR},
+        "md_quote": {"font": f["italic"], "foreground": Theme.SYSTEM_COLOR,
+                     "lmargin1": 40, "lmargin2": 40},
+        "md_quote_bar": {"foreground": Theme.ACCENT_COLOR, "font": f["bold"]},
+    }
+    # Tuples become Tcl lists, so fonts and tab stops need no manual quoting
+    specs = []
+    for name, opts in styles.items():
+        specs += [name, tuple(x for key, val in opts.items() for x in (f"-{key}", val))]
+    display.tk.call(
+        "foreach", ("name", "opts"), tuple(specs),
+        f"{display} tag configure $name {{*}}$opts"
+    )
+
+def create_jump_button(parent, fonts, on_click):
+    """Builds the canvas-drawn "Jump to latest" button."""
+    canvas = tk.Canvas(
+        parent, width=300, height=80,
+        bg=Theme.BG_COLOR, highlightthickness=0, bd=0
+    )
+
+    # Shadow (drawn first)
+    round_rectangle(
+        canvas, (8, 8, 292, 72), radius=25,
+        fill="#111111", outline="", width=0, tags=("btn", "btn_shadow")
+    )
+
+    # Draw the button content
+    round_rectangle(
+        canvas, (2, 2, 284, 64), radius=25,
+        fill=Theme.JUMP_BTN_BG, outline="", width=0, tags=("btn", "btn_bg")
+    )
+
+    # Text (Simple, no border)
+    canvas.create_text(
+        143, 33, text="↓   Jump to latest", fill=Theme.FG_COLOR,
+        font=fonts["bold"], tags=("btn", "btn_text")
+    )
+
+    # Bindings (one per event on the shared tag covering all three items)
+    canvas.tag_bind("btn", "<Button-1>", lambda e: on_click())
+    canvas.tag_bind("btn", "<Enter>", lambda e: canvas.config(cursor="hand2"))
+    canvas.tag_bind("btn", "<Leave>", lambda e: canvas.config(cursor=""))
+    return canvas
+
+def build_model_sidebar(sidebar, fonts, models, on_select, on_close):
+    """Constructs the model selection UI components inside the sidebar frame."""
+    for widget in sidebar.frame.winfo_children():
+        widget.destroy()
+
+    sidebar.frame.grid()
+
+    header = tk.Frame(sidebar.frame, bg=Theme.BG_COLOR)
+    header.pack(fill="x", padx=10, pady=(5, 0))
+    header.grid_columnconfigure(0, weight=1)
+
+    tk.Label(header, text="Models", font=fonts["h3"],
+             bg=Theme.BG_COLOR, fg=Theme.FG_COLOR).grid(row=0, column=0)
+
+    tk.Button(header, text="<", command=on_close, font=("Roboto", 24),
+              bg=Theme.BG_COLOR, fg=Theme.SYSTEM_COLOR, borderwidth=0,
+              highlightthickness=0, activebackground=Theme.BG_COLOR,
+              activeforeground=Theme.FG_COLOR, cursor="hand2").grid(row=0, column=0, sticky="w")
+
+    sidebar.canvas = tk.Canvas(sidebar.frame, bg=Theme.BG_COLOR, highlightthickness=0)
+    sidebar.canvas.pack(fill="both", expand=True, padx=10, pady=(2, 0))
+
+    sidebar.bg_id = round_rectangle(
+        sidebar.canvas, (4, 4, 10, 10), radius=25,
+        outline=Theme.ACCENT_COLOR, width=6, fill=Theme.INPUT_BG
+    )
+
+    inner = tk.Frame(sidebar.canvas, bg=Theme.INPUT_BG)
+    sidebar.window_id = sidebar.canvas.create_window(12, 12, anchor="nw", window=inner)
+
+    _create_model_listbox(inner, fonts, models, on_select)
+
+    def _on_configure(event):
+        """Maintains the sidebar background shape on resize."""
+        sidebar.bg_id = update_canvas_region(CanvasConfig(
+            canvas=sidebar.canvas,
+            bg_id=sidebar.bg_id,
+            size=(event.width, event.height),
+            radius=25,
+            style=(Theme.ACCENT_COLOR, 6, Theme.INPUT_BG),
+            win_id=sidebar.window_id,
+            pad=(12, 12)
+        ))
+
+    sidebar.canvas.bind("<Configure>", _on_configure)
+
+def _create_model_listbox(parent, fonts, models, on_select):
+    """Creates and populates the model listbox."""
+    listbox = tk.Listbox(
+        parent, font=fonts["base"], bg=Theme.INPUT_BG,
+        fg=Theme.FG_COLOR, selectbackground=Theme.USER_COLOR,
+        selectforeground=Theme.BG_COLOR, borderwidth=0,
+        highlightthickness=0, activestyle='none', width=25
+    )
+    listbox.pack(side="left", fill="both", expand=True)
+
+    scrollbar = CustomScrollbar(parent, command=listbox.yview, bg=Theme.INPUT_BG)
+    scrollbar.pack(side="right", fill="y")
+    listbox.config(yscrollcommand=scrollbar.set)
+
+    curr = config.MODEL_NAME
+    for i, model in enumerate(models):
+        display_name = f"{model} (Current)" if model == curr else model
+        listbox.insert(tk.END, display_name)
+        if model == curr:
+            listbox.selection_set(i)
+            listbox.see(i)
+
+    def _confirm(_=None):
+        selection = listbox.curselection()
+        on_select(models[selection[0]] if selection else None)
+
+    listbox.bind("<Return>", _confirm)
+    listbox.bind("<Double-Button-1>", _confirm)
+    listbox.focus_set()
+
+def trim_chat_history(display, max_lines, url_map):
+    """
+    Deletes the oldest lines once the chat display grows past max_lines.
+    The cut is moved to the end of the next separator so the remaining
+    history starts on a whole turn. Links left without any text are dropped
+    from url_map along with their tags.
+    """
+    excess = int(display.index("end-1c").split(".")[0]) - max_lines
+    if excess <= 0:
+        return
+    cut = f"{excess + 1}.0"
+    sep = display.tag_nextrange("separator", cut)
+    if sep:
+        cut = sep[1]
+    # Tk drops embedded tables/rules with their text; destroy the Python side too
+    for _, name, _ in display.dump("1.0", cut, window=True):
+        try:
+            display.nametowidget(name).destroy()
+        except (KeyError, tk.TclError):
+            pass
+    display.delete("1.0", cut)
+    for tag in [tag for tag in url_map if not display.tag_ranges(tag)]:
+        del url_map[tag]
+        display.tag_delete(tag)
+
+@contextmanager
+def editable(text_widget):
+    """Temporarily enables a read-only Text widget for a batch of edits."""
+    text_widget.config(state='normal')
+    try:
+        yield text_widget
+    finally:
+        text_widget.config(state='disabled')
+
+def debounce(widget, jobs, key, callback, delay_ms=config.RESIZE_DEBOUNCE_MS):
+    """Schedules callback after delay_ms, replacing any pending call for key."""
+    pending = jobs.get(key)
+    if pending:
+        widget.after_cancel(pending)
+    jobs[key] = widget.after(delay_ms, callback)
+
+def update_lower_border(ui_input, size):
+    """Redraws the input area border at the given canvas (width, height)."""
+    w, h = size
     if w < 10 or h < 10:
         return ui_input.bg_id
 
-    inner_h = ui_input.field.winfo_reqheight()
+    inner_h = (ui_input.height or h) - 2 * INPUT_BORDER_PAD
     cfg = CanvasConfig(
         canvas=ui_input.canvas,
         bg_id=ui_input.bg_id,
@@ -39,57 +238,71 @@ def update_lower_border(ui_input, forced_h=None):
     )
     return update_canvas_region(cfg)
 
-def highlight_commands(ui_input, commands):
-    """Applies syntax highlighting to valid slash commands."""
+def highlight_commands(ui_input, command_set):
+    """Applies syntax highlighting to a valid slash command on the first line."""
+    # Removing a tag walks tag toggles, not text, so clearing everywhere stays
+    # cheap and also covers a highlight pushed down by an inserted newline
     ui_input.field.tag_remove("command_highlight", "1.0", tk.END)
-    content = ui_input.field.get("1.0", tk.END).strip()
-    if content.startswith("/"):
-        end_idx = content.find(" ")
-        if end_idx == -1:
-            end_idx = content.find("\n")
+    line = ui_input.field.get("1.0", "1.end")
+    if not line.startswith("/"):
+        return
+    cmd = line.split(" ", 1)[0]
+    if cmd in command_set:
+        ui_input.field.tag_add("command_highlight", "1.0", f"1.{len(cmd)}")
 
-        cmd = content[:end_idx] if end_idx != -1 else content
-        valid_cmds = [c[0] for c in commands]
-
-        if cmd in valid_cmds:
-            tag_end = f"1.{end_idx}" if end_idx != -1 else "1.end"
-            ui_input.field.tag_add("command_highlight", "1.0", tag_end)
-
-def handle_tab(ui_input, commands):
-    """Handles Tab key for command completion."""
+def handle_tab(ui_input, command_names):
+    """Handles Tab key for command completion over the sorted command names."""
     content = ui_input.field.get("1.0", tk.INSERT).strip()
     if content.startswith("/"):
-        matches = [c[0] for c in commands if c[0].startswith(content)]
+        matches = []
+        for name in islice(command_names, bisect_left(command_names, content), None):
+            if not name.startswith(content):
+                break
+            matches.append(name)
         if matches:
             ui_input.field.delete("1.0", tk.INSERT)
             ui_input.field.insert("1.0", min(matches, key=len))
         return "break"
     return None
 
-def adjust_input_height(ui_input):
-    """Dynamically adjusts the input field height based on content."""
+def adjust_input_height(ui_input, field_w, canvas_w):
+    """
+    Dynamically adjusts the input field height based on content.
+    Widths come from the last Configure events rather than Tk queries.
+    """
     try:
-        if ui_input.field.winfo_width() <= 1:
+        if field_w <= 1:
             new_h = 1
         else:
             content = ui_input.field.get("1.0", "end-1c")
             if not content:
                 new_h = 1
             else:
-                ui_input.field.update_idletasks()
                 try:
-                    res = ui_input.field.count("1.0", "end", "displaylines")
-                    new_h = res[0] if res else 1
+                    # "update" refreshes only this widget's wrap metrics, which can
+                    # lag a keystroke or resize; with it, Python < 3.13 returns a bare int
+                    res = ui_input.field.count("1.0", "end", "update", "displaylines")
+                    new_h = res if isinstance(res, int) else (res[0] if res else 1)
                 except (tk.TclError, AttributeError):
                     new_h = content.count('\n') + 1
 
-        new_h = min(max(new_h, 1), 8)
+        new_h = min(max(new_h, 1), INPUT_MAX_LINES)
+        total_h = new_h * ui_input.line_h + 2 * (INPUT_PAD_Y + INPUT_BORDER_PAD)
+        if total_h == ui_input.height:
+            return
+        ui_input.height = total_h
         ui_input.field.config(height=new_h)
-        ui_input.field.update_idletasks()
-
-        total_h = ui_input.field.winfo_reqheight() + 20
-        if abs(int(ui_input.canvas.cget("height")) - total_h) > 2:
-            ui_input.canvas.config(height=total_h)
-            ui_input.bg_id = update_lower_border(ui_input, total_h)
+        ui_input.canvas.config(height=total_h)
+        ui_input.bg_id = update_lower_border(ui_input, (canvas_w, total_h))
     except tk.TclError:
         pass
+
+def coalesce_text_actions(batch, tags):
+    """Merges consecutive queued text actions that share a tag into one action."""
+    merged = []
+    for (action, tag), group in groupby(batch, key=lambda item: (item[0], item[2])):
+        if action == "text" and tag in tags:
+            merged.append((action, "".join(item[1] for item in group), tag))
+        else:
+            merged.extend(group)
+    return merged
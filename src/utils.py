@@ -7,6 +7,7 @@ import os
 import re
 import subprocess
 import sys
+import threading
 import traceback
 
 import psutil
@@ -89,8 +90,8 @@ def info_print(msg):
     logger.info(msg)
     print(msg)
 
-def round_rectangle(canvas, coords, radius=25, **kwargs):
-    """Draws a rounded rectangle on a Tkinter Canvas."""
+def rounded_coords(coords, radius=25):
+    """Returns the smoothed polygon vertices for a rounded rectangle."""
     x1, y1, x2, y2 = coords
     # Ensure radius doesn't exceed dimensions to avoid visual glitches
     width = abs(x2 - x1)
@@ -100,13 +101,16 @@ def round_rectangle(canvas, coords, radius=25, **kwargs):
     if radius > height // 2:
         radius = max(1, height // 2)
 
-    pts = [
+    return [
         x1+radius, y1, x1+radius, y1, x2-radius, y1, x2-radius, y1, x2, y1,
         x2, y1+radius, x2, y1+radius, x2, y2-radius, x2, y2-radius, x2, y2,
         x2-radius, y2, x2-radius, y2, x1+radius, y2, x1+radius, y2, x1, y2,
         x1, y2-radius, x1, y2-radius, x1, y1+radius, x1, y1+radius, x1, y1
     ]
-    return canvas.create_polygon(pts, **kwargs, smooth=True)
+
+def round_rectangle(canvas, coords, radius=25, **kwargs):
+    """Draws a rounded rectangle on a Tkinter Canvas."""
+    return canvas.create_polygon(rounded_coords(coords, radius), **kwargs, smooth=True)
 
 def _get_amd_vram():
     """Detects AMD VRAM using sysfs."""
@@ -209,26 +213,34 @@ def verify_env_health():
     return len(errors) == 0, errors
 
 class RedirectedStdout:
-    """Redirects stdout to a queue for GUI display."""
+    """Redirects stdout to a queue for GUI display, one queue item per line."""
     def __init__(self, queue, tag="system"):
         self.queue = queue
         self.tag = tag
         self._original_stdout = sys.__stdout__
+        self._buf = []
+        self._lock = threading.Lock()
 
     def write(self, string):
-        """Writes to the queue and optionally to original stdout."""
+        """Buffers text until a newline, then writes completed lines to the queue."""
         if not string:
             return
 
-        # Handle Carriage Return for progress bars
-        if string.startswith('\r'):
-            clean = strip_ansi(string[1:])
-            if clean:
-                self.queue.put(("replace_last", clean, self.tag))
-        else:
-            clean = strip_ansi(string)
-            if clean:
-                self.queue.put(("text", clean, self.tag))
+        # Only the buffer is touched under the lock: put() wakes the Tk thread,
+        # which may itself be printing and waiting for this lock
+        with self._lock:
+            # Handle Carriage Return for progress bars
+            if string.startswith('\r'):
+                items = self._take_pending()
+                items.append(("replace_last", strip_ansi(string[1:])))
+            else:
+                self._buf.append(string)
+                items = []
+                if "\n" in string:
+                    done, sep, rest = "".join(self._buf).rpartition("\n")
+                    self._buf = [rest] if rest else []
+                    items.append(("text", strip_ansi(done + sep)))
+        self._put_all(items)
 
         if config.DEBUG:
             try:
@@ -238,5 +250,59 @@ class RedirectedStdout:
                 pass
 
     def flush(self):
-        """Flushes the stream."""
-        # No-op for redirect
+        """Writes any buffered partial line to the queue."""
+        with self._lock:
+            items = self._take_pending()
+        self._put_all(items)
+
+    def _take_pending(self):
+        """Empties the buffer into a list of queue items; call with the lock held."""
+        if not self._buf:
+            return []
+        pending = "".join(self._buf)
+        self._buf = []
+        return [("text", strip_ansi(pending))]
+
+    def _put_all(self, items):
+        for action, clean in items:
+            if clean:
+                self.queue.put((action, clean, self.tag))
+
+class CoalescingWorker:
+    """
+    Runs a job on a single long-lived daemon thread. Requests made while a run
+    is still pending collapse into it; a request during a run triggers one more.
+    """
+    def __init__(self, job, name="worker"):
+        self._job = job
+        self._name = name
+        self._wanted = threading.Event()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def request(self):
+        """Asks for the job to run soon, starting the worker on first use."""
+        self._wanted.set()
+        # Requests come from both the init thread and the Tk thread
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name=self._name, daemon=True)
+                self._thread.start()
+
+    def cancel(self):
+        """Drops a pending request that has not started running yet."""
+        self._wanted.clear()
+
+    def _run(self):
+        try:
+            while True:
+                self._wanted.wait()
+                self._wanted.clear()
+                self._job()
+        finally:
+            # A failed job is logged by threading.excepthook; a fresh thread
+            # takes over so later requests are not left waiting on a dead one
+            with self._start_lock:
+                self._thread = None
+            if self._wanted.is_set():
+                self.request()
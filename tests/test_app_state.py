@@ -0,0 +1,66 @@
+"""
+Unit tests for application state structures.
+"""
+import unittest
+from unittest.mock import MagicMock
+from app_state import MessageQueue, ResponseState
+
+class TestMessageQueue(unittest.TestCase):
+    """Test suite for MessageQueue."""
+
+    def test_drain_returns_items_in_order(self):
+        """Drain pops every pending item in FIFO order."""
+        q = MessageQueue()
+        for i in range(3):
+            q.put(("text", str(i), "system"))
+        self.assertEqual([c for _, c, _ in q.drain()], ["0", "1", "2"])
+        self.assertEqual(q.drain(), [])
+
+    def test_drain_respects_limit(self):
+        """A bounded drain leaves the remainder queued for the next call."""
+        q = MessageQueue()
+        for i in range(5):
+            q.put(("text", str(i), "system"))
+        self.assertEqual([c for _, c, _ in q.drain(2)], ["0", "1"])
+        self.assertEqual([c for _, c, _ in q.drain()], ["2", "3", "4"])
+
+    def test_requeue_puts_items_back_at_the_head(self):
+        """Requeued items come out first, in order, and wake the consumer."""
+        q = MessageQueue()
+        q.wake = MagicMock()
+        q.put(("text", "later", "system"))
+        q.wake_pending = False
+        q.requeue([("text", "a", "system"), ("enable", None, None)])
+        self.assertEqual([c for _, c, _ in q.drain()], ["a", None, "later"])
+        q.wake.assert_called()
+
+    def test_wake_is_coalesced_until_consumer_resets(self):
+        """Repeated puts wake the consumer once until it clears the flag."""
+        q = MessageQueue()
+        q.wake = MagicMock()
+        q.put(("enable", None, None))
+        q.put(("enable", None, None))
+        self.assertEqual(q.wake.call_count, 1)
+
+        q.wake_pending = False
+        q.put(("enable", None, None))
+        self.assertEqual(q.wake.call_count, 2)
+
+class TestResponseState(unittest.TestCase):
+    """Test suite for ResponseState."""
+
+    def test_chunks_are_joined_on_read(self):
+        """Appended chunks read back as one string until reset."""
+        resp = ResponseState()
+        for chunk in ("Hel", "lo", "\n"):
+            resp.append(chunk)
+        self.assertEqual(resp.full_text, "Hello\n")
+        resp.append("Bye")
+        self.assertEqual(resp.full_text, "Hello\nBye")
+
+        resp.stable_offset = 6
+        resp.reset()
+        self.assertEqual((resp.full_text, resp.stable_offset), ("", 0))
+
+if __name__ == "__main__":
+    unittest.main()
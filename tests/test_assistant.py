@@ -105,6 +105,22 @@ class TestLocalChatAssistant(BaseAssistantTest):
 
         self.assertIsNone(result)
 
+    def test_history_is_bounded(self):
+        """Test that short-term history keeps only the most recent messages."""
+        for i in range(30):
+            self.assistant.messages.append({"role": "user", "content": str(i)})
+        self.assertEqual(len(self.assistant.messages), 20)
+        self.assertEqual(self.assistant.messages[0]["content"], "10")
+
+    @patch('local_assistant.get_model_info')
+    def test_model_info_reads_history_snapshot(self, mock_info):
+        """Test that stats are computed from a copy of the history, not the live deque."""
+        self.assistant.messages.append({"role": "user", "content": "hi"})
+        self.assistant.get_model_info()
+        passed = mock_info.call_args.args[2]
+        self.assertEqual(passed, [{"role": "user", "content": "hi"}])
+        self.assertIsNot(passed, self.assistant.messages)
+
     def test_clear_long_term_memory(self):
         """Test clearing long term memory."""
         self.assistant.clear_long_term_memory()
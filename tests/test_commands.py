@@ -4,7 +4,7 @@ Unit tests for application commands.
 import unittest
 from unittest.mock import MagicMock, patch
 import config
-from app import AssistantApp
+from app import AssistantApp, COMMAND_HANDLERS, QUEUE_ACTION_HANDLERS
 
 class TestCommands(unittest.TestCase):
     """Test suite for application commands."""
@@ -21,8 +21,9 @@ class TestCommands(unittest.TestCase):
             patch('app.round_rectangle'),
             patch('app.CustomScrollbar'),
             patch('app.MarkdownEngine'),
-            patch('app.mistune.create_markdown'),
-            patch('app.local_assistant.LocalChatAssistant')
+            patch('mistune.create_markdown'),
+            patch('local_assistant.LocalChatAssistant'),
+            patch('app.verify_env_health', return_value=(True, []))
         ]
 
         # Start all patchers and get mocks
@@ -44,7 +45,10 @@ class TestCommands(unittest.TestCase):
         # Tk mock (index 0)
         root = mocks[0].return_value
 
-        self.app = AssistantApp(root)
+        # Run background initialization inline so it cannot race the test
+        with patch('app.threading.Thread') as mock_thread:
+            mock_thread.side_effect = lambda target, **_kwargs: MagicMock(start=target)
+            self.app = AssistantApp(root)
         # Manually trigger assistant initialization with a mock
         self.app.state.assistant = MagicMock()
         self.app.state.assistant.messages = []
@@ -63,9 +67,7 @@ class TestCommands(unittest.TestCase):
         self.assertEqual(self.app.state.assistant.messages, [])
 
         # Check queue for expected signals
-        queue_actions = []
-        while not self.app.state.msg_queue.empty():
-            queue_actions.append(self.app.state.msg_queue.get()[0])
+        queue_actions = [item[0] for item in self.app.state.msg_queue.drain()]
 
         self.assertIn("clear", queue_actions)
         self.assertIn("enable", queue_actions)
@@ -76,9 +78,7 @@ class TestCommands(unittest.TestCase):
         self.app.process_input("/forget")
         self.app.state.assistant.clear_long_term_memory.assert_called_once()
 
-        queue_actions = []
-        while not self.app.state.msg_queue.empty():
-            queue_actions.append(self.app.state.msg_queue.get()[0])
+        queue_actions = [item[0] for item in self.app.state.msg_queue.drain()]
         self.assertIn("enable", queue_actions)
 
     def test_command_debug_logic(self):
@@ -97,9 +97,7 @@ class TestCommands(unittest.TestCase):
         # Verify that /info puts toggle_info in queue
         self.app.process_input("/info")
 
-        queue_actions = []
-        while not self.app.state.msg_queue.empty():
-            queue_actions.append(self.app.state.msg_queue.get()[0])
+        queue_actions = [item[0] for item in self.app.state.msg_queue.drain()]
         self.assertIn("toggle_info", queue_actions)
 
     @patch('app.run_ollama_bypass')
@@ -118,14 +116,59 @@ class TestCommands(unittest.TestCase):
         mock_bypass.assert_called_once()
         self.assertIn("hi", mock_bypass.call_args[0])
 
-        queue_actions = []
-        while not self.app.state.msg_queue.empty():
-            queue_actions.append(self.app.state.msg_queue.get()[0])
+        queue_actions = [item[0] for item in self.app.state.msg_queue.drain()]
 
         self.assertIn("start_indicator", queue_actions)
         self.assertIn("text", queue_actions)
         self.assertIn("final_render", queue_actions)
         self.assertIn("enable", queue_actions)
 
+    @patch('app.get_ollama_client')
+    @patch('app.threading.Thread')
+    def test_streaming_chunks_are_coalesced(self, mock_thread, mock_get_client):
+        """Test that streamed tokens are batched per line before queueing."""
+        mock_thread.side_effect = lambda target, **_kwargs: MagicMock(start=target)
+        tokens = ["Hel", "lo", " world", "\n", "Bye"]
+        mock_get_client.return_value.chat.return_value = [
+            {"message": {"content": tok}} for tok in tokens
+        ]
+        self.app.state.assistant.decide_and_search.return_value = None
+
+        self.app.process_input("Tell me something")
+
+        texts = [
+            content for action, content, tag in self.app.state.msg_queue.drain()
+            if action == "text" and tag == "assistant"
+        ]
+        self.assertEqual("".join(texts), "Hello world\nBye\n")
+        self.assertLess(len(texts), len(tokens))
+
+    def test_markdown_parser_is_installed_through_the_queue(self):
+        """The init thread queues the built parser instead of assigning it directly."""
+        self.assertEqual(self.app.md_parser("x"), [{"type": "text", "text": "x"}])
+        queued = [
+            content for action, content, _tag in self.app.state.msg_queue.drain()
+            if action == "set_parser"
+        ]
+        self.assertEqual(len(queued), 1)
+        self.assertTrue(callable(queued[0]))
+
+    def test_unexpected_action_error_keeps_rest_of_batch(self):
+        """Actions after one that raises unexpectedly stay queued for the next drain."""
+        drain = self.app.root.after.call_args_list[0].args[1]
+        self.app.state.msg_queue.drain()
+        self.app.ui.info_panel = MagicMock()
+        self.app.ui.info_panel.update_stats.side_effect = KeyError("ram_mb")
+        self.app.state.msg_queue.put(("update_info_ui", {}, None))
+        self.app.state.msg_queue.put(("enable", None, None))
+        with self.assertRaises(KeyError):
+            drain()
+        self.assertEqual(self.app.state.msg_queue.drain(), [("enable", None, None)])
+
+    def test_handler_tables_name_existing_methods(self):
+        """Every command and queue action maps to a callable on the app."""
+        for name in [*COMMAND_HANDLERS.values(), *QUEUE_ACTION_HANDLERS.values()]:
+            self.assertTrue(callable(getattr(self.app, name, None)), name)
+
 if __name__ == "__main__":
     unittest.main()
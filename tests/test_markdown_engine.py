@@ -4,7 +4,7 @@ Unit tests for the MarkdownEngine class.
 import tkinter as tk
 import unittest
 from unittest.mock import MagicMock, patch
-from markdown_engine import MarkdownEngine
+from markdown_engine import MarkdownEngine, create_markdown_parser, find_stable_boundary
 
 class TestMarkdownEngine(unittest.TestCase):
     """Test suite for MarkdownEngine."""
@@ -230,5 +230,44 @@ class TestMarkdownEngine(unittest.TestCase):
             self.assertIn('H1', calls)
             self.assertIn('B1', calls)
 
+class TestStableBoundary(unittest.TestCase):
+    """Test suite for detecting completed blocks in streamed Markdown."""
+
+    def test_open_paragraph_is_not_stable(self):
+        """Text without a finished block has no stable prefix."""
+        self.assertEqual(find_stable_boundary("Hello **wor"), 0)
+        self.assertEqual(find_stable_boundary("Para one\n\n"), 0)
+
+    def test_blank_line_then_new_block(self):
+        """A blank line followed by a complete new line closes the block."""
+        text = "Para one\n\n# Heading\nTail"
+        self.assertEqual(find_stable_boundary(text), len("Para one\n\n"))
+
+    def test_incomplete_next_line_waits(self):
+        """The line after the blank must be complete before committing."""
+        self.assertEqual(find_stable_boundary("Para one\n\nPara tw"), 0)
+
+    def test_list_continuation_is_not_split(self):
+        """Loose list items after a blank line may still belong to the list."""
+        self.assertEqual(find_stable_boundary("- a\n\n- b\n"), 0)
+        self.assertEqual(find_stable_boundary("1. a\n\n2. b\n"), 0)
+
+    def test_blank_lines_inside_fence_are_ignored(self):
+        """Blank lines inside an open code fence do not end a block."""
+        text = "```\ncode\n\nmore\n"
+        self.assertEqual(find_stable_boundary(text), 0)
+        closed = "```\ncode\n\nmore\n```\n\nAfter\n"
+        self.assertEqual(find_stable_boundary(closed), closed.index("After"))
+
+class TestMarkdownParser(unittest.TestCase):
+    """Tests for the lazily built mistune parser."""
+
+    def test_parser_produces_ast_with_plugins(self):
+        """The parser returns AST tokens and understands superscript."""
+        tokens = create_markdown_parser()("x^2^")
+        self.assertEqual(tokens[0]["type"], "paragraph")
+        types = [child["type"] for child in tokens[0]["children"]]
+        self.assertIn("superscript", types)
+
 if __name__ == "__main__":
     unittest.main()
@@ -67,5 +67,24 @@ class TestStatsCollector(unittest.TestCase):
         self.assertEqual(stats['ram_mb'], 0)
         self.assertEqual(stats['vram_mb'], 0)
 
+    @patch('stats_collector.get_ollama_client')
+    def test_context_length_fetched_once_per_model(self, mock_get_client):
+        """Test that the model's context length is not refetched on every refresh."""
+        mock_client = mock_get_client.return_value
+        mock_client.ps.return_value = MagicMock(models=[])
+        mock_client.show.return_value.model_dump.return_value = {
+            'modelinfo': {'gemma3.context_length': 4096}
+        }
+        mock_memory = MagicMock()
+        mock_memory.get_fact_count.return_value = 0
+
+        with patch('config.MODEL_NAME', 'cache-test:1b'):
+            first = get_model_info(mock_memory, "x" * 400, [])
+            second = get_model_info(mock_memory, "x" * 400, [])
+
+        self.assertEqual(mock_client.show.call_count, 1)
+        self.assertEqual(first['context_pct'], second['context_pct'])
+        self.assertGreater(first['context_pct'], 0)
+
 if __name__ == "__main__":
     unittest.main()
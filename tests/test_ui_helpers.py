@@ -0,0 +1,159 @@
+"""
+Unit tests for GUI helper functions.
+"""
+import unittest
+from unittest.mock import MagicMock
+from app_state import SLASH_COMMAND_NAMES, SLASH_COMMAND_SET
+from app_state import CanvasConfig, InputUI
+from ui_helpers import (
+    adjust_input_height, coalesce_text_actions, debounce, editable, handle_tab, highlight_commands,
+    trim_chat_history, update_canvas_region
+)
+from utils import rounded_coords
+
+class TestUIHelpers(unittest.TestCase):
+    """Test suite for ui_helpers."""
+
+    def test_coalesce_merges_consecutive_text(self):
+        """Consecutive text chunks with the same tag become one action."""
+        batch = [
+            ("text", "Hel", "assistant"),
+            ("text", "lo", "assistant"),
+            ("text", "\n", "assistant"),
+        ]
+        self.assertEqual(
+            coalesce_text_actions(batch, ("assistant",)),
+            [("text", "Hello\n", "assistant")]
+        )
+
+    def test_coalesce_preserves_order_across_boundaries(self):
+        """Tag changes and non-text actions split runs without reordering."""
+        batch = [
+            ("text", "a", "assistant"),
+            ("text", "b", "system"),
+            ("text", "c", "system"),
+            ("enable", None, None),
+            ("text", "d", "assistant"),
+            ("text", "e", "user"),
+            ("text", "f", "user"),
+        ]
+        self.assertEqual(
+            coalesce_text_actions(batch, ("assistant", "system")),
+            [
+                ("text", "a", "assistant"),
+                ("text", "bc", "system"),
+                ("enable", None, None),
+                ("text", "d", "assistant"),
+                ("text", "e", "user"),
+                ("text", "f", "user"),
+            ]
+        )
+
+    def test_handle_tab_completes_unique_prefix(self):
+        """Tab completes a slash-command prefix to the matching command."""
+        ui_input = MagicMock()
+        ui_input.field.get.return_value = "/he"
+        self.assertEqual(handle_tab(ui_input, SLASH_COMMAND_NAMES), "break")
+        ui_input.field.insert.assert_called_once_with("1.0", "/help")
+
+    def test_handle_tab_ignores_unknown_prefix(self):
+        """Tab leaves input untouched when no command matches."""
+        ui_input = MagicMock()
+        ui_input.field.get.return_value = "/zz"
+        self.assertEqual(handle_tab(ui_input, SLASH_COMMAND_NAMES), "break")
+        ui_input.field.insert.assert_not_called()
+
+    def test_highlight_commands_marks_known_command(self):
+        """A known command at the start of input is highlighted."""
+        ui_input = MagicMock()
+        ui_input.field.get.return_value = "/clear now"
+        highlight_commands(ui_input, SLASH_COMMAND_SET)
+        ui_input.field.tag_add.assert_called_once_with("command_highlight", "1.0", "1.6")
+        ui_input.field.get.assert_called_once_with("1.0", "1.end")
+
+    def test_adjust_input_height_skips_unchanged_height(self):
+        """Input resizing only reconfigures widgets when the height changes."""
+        ui_input = InputUI(canvas=MagicMock(), field=MagicMock(), line_h=16)
+        ui_input.field.get.return_value = "one\ntwo"
+        ui_input.field.count.return_value = 2
+        adjust_input_height(ui_input, 200, 300)
+        ui_input.field.count.assert_called_once_with("1.0", "end", "update", "displaylines")
+        self.assertEqual(ui_input.height, 2 * 16 + 40)
+        ui_input.field.config.assert_called_once_with(height=2)
+        adjust_input_height(ui_input, 200, 300)
+        ui_input.field.config.assert_called_once_with(height=2)
+        ui_input.field.update_idletasks.assert_not_called()
+        ui_input.field.winfo_reqheight.assert_not_called()
+        ui_input.canvas.winfo_width.assert_not_called()
+
+    def test_editable_restores_disabled_state_on_error(self):
+        """The widget is made read-only again even if an edit fails."""
+        widget = MagicMock()
+        with self.assertRaises(ValueError):
+            with editable(widget):
+                raise ValueError("boom")
+        self.assertEqual(
+            [c.kwargs for c in widget.config.call_args_list],
+            [{"state": "normal"}, {"state": "disabled"}]
+        )
+
+    def test_debounce_cancels_pending_callback(self):
+        """A new resize event replaces the previously scheduled redraw."""
+        widget = MagicMock()
+        widget.after.side_effect = ["after#1", "after#2"]
+        jobs = {}
+        debounce(widget, jobs, "chat", print)
+        debounce(widget, jobs, "chat", print)
+        widget.after_cancel.assert_called_once_with("after#1")
+        self.assertEqual(jobs, {"chat": "after#2"})
+
+    def test_debounce_uses_given_delay(self):
+        """Callers can override the default resize delay."""
+        widget = MagicMock()
+        debounce(widget, {}, "typing", print, 30)
+        widget.after.assert_called_once_with(30, print)
+
+    def test_update_canvas_region_reuses_border_item(self):
+        """Resizing moves the existing border polygon instead of recreating it."""
+        canvas = MagicMock()
+        cfg = CanvasConfig(
+            canvas=canvas, bg_id=7, size=(200, 100), radius=20,
+            style=("#fff", 6, "#000"), win_id=8, pad=(10, 10)
+        )
+        self.assertEqual(update_canvas_region(cfg), 7)
+        canvas.coords.assert_any_call(7, *rounded_coords((4, 4, 196, 96), 20))
+        canvas.delete.assert_not_called()
+        canvas.create_polygon.assert_not_called()
+
+    def test_trim_chat_history_cuts_after_separator(self):
+        """Old turns are dropped up to a separator, destroying their embedded widgets."""
+        display = MagicMock()
+        display.index.return_value = "5010.0"
+        display.tag_nextrange.return_value = ("14.0", "15.0")
+        display.dump.return_value = [("window", ".!text.!frame", "3.0")]
+        trim_chat_history(display, 5000, {})
+        display.tag_nextrange.assert_called_once_with("separator", "11.0")
+        display.nametowidget.return_value.destroy.assert_called_once()
+        display.delete.assert_called_once_with("1.0", "15.0")
+
+    def test_trim_chat_history_forgets_deleted_links(self):
+        """URLs whose link text was trimmed are dropped; links still shown are kept."""
+        display = MagicMock()
+        display.index.return_value = "5010.0"
+        display.tag_nextrange.return_value = ()
+        display.dump.return_value = []
+        display.tag_ranges.side_effect = lambda tag: () if tag == "link_data_1" else ("9.0", "9.4")
+        url_map = {"link_data_1": "https://old.example", "link_data_2": "https://new.example"}
+        trim_chat_history(display, 5000, url_map)
+        self.assertEqual(url_map, {"link_data_2": "https://new.example"})
+        display.tag_delete.assert_called_once_with("link_data_1")
+
+    def test_trim_chat_history_keeps_short_history(self):
+        """Nothing is deleted while the display is within the cap."""
+        display = MagicMock()
+        display.index.return_value = "120.0"
+        trim_chat_history(display, 5000, {})
+        display.delete.assert_not_called()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,130 @@
+"""
+Unit tests for utility helpers.
+"""
+import threading
+import unittest
+from unittest.mock import patch
+from app_state import MessageQueue
+from utils import CoalescingWorker, RedirectedStdout
+
+class TestRedirectedStdout(unittest.TestCase):
+    """Test suite for RedirectedStdout."""
+
+    def setUp(self):
+        self.queue = MessageQueue()
+        self.stream = RedirectedStdout(self.queue, "system")
+
+    def test_print_produces_one_item_per_line(self):
+        """Fragments are buffered until the line is complete."""
+        print("Chat Assistant", "ready.", file=self.stream)
+        self.assertEqual(self.queue.drain(), [("text", "Chat Assistant ready.\n", "system")])
+
+    def test_partial_line_waits_for_flush(self):
+        """Text without a newline is held back until flushed."""
+        self.stream.write("one\ntwo")
+        self.assertEqual(self.queue.drain(), [("text", "one\n", "system")])
+        self.stream.flush()
+        self.assertEqual(self.queue.drain(), [("text", "two", "system")])
+
+    def test_carriage_return_flushes_pending_text(self):
+        """Progress updates keep their order relative to buffered text."""
+        self.stream.write("Pulling")
+        self.stream.write("\r[##] 50%")
+        self.assertEqual(self.queue.drain(), [
+            ("text", "Pulling", "system"),
+            ("replace_last", "[##] 50%", "system"),
+        ])
+
+    def test_lock_is_not_held_while_queue_wakes_consumer(self):
+        """A put that blocks in wake does not stop other threads from writing."""
+        in_wake, release = threading.Event(), threading.Event()
+
+        def blocking_wake():
+            in_wake.set()
+            release.wait(1)
+
+        self.queue.wake = blocking_wake
+        worker = threading.Thread(target=self.stream.write, args=("from worker\n",))
+        worker.start()
+        self.assertTrue(in_wake.wait(1))
+
+        main_write = threading.Thread(target=self.stream.write, args=("from main\n",))
+        main_write.start()
+        main_write.join(1)
+        finished = not main_write.is_alive()
+        release.set()
+        worker.join(1)
+        self.assertTrue(finished)
+        self.assertEqual(
+            sorted(content for _, content, _ in self.queue.drain()),
+            ["from main\n", "from worker\n"]
+        )
+
+class TestCoalescingWorker(unittest.TestCase):
+    """Test suite for CoalescingWorker."""
+
+    def test_requests_during_run_collapse_into_one_rerun(self):
+        """Several requests made while the job runs cause a single extra run."""
+        started, release, finished = threading.Event(), threading.Event(), threading.Event()
+        runs = []
+
+        def job():
+            runs.append(threading.current_thread().name)
+            if len(runs) == 1:
+                started.set()
+                release.wait(1)
+            else:
+                finished.set()
+
+        worker = CoalescingWorker(job, "info")
+        worker.request()
+        self.assertTrue(started.wait(1))
+        for _ in range(5):
+            worker.request()
+        release.set()
+        self.assertTrue(finished.wait(1))
+        self.assertEqual(runs, ["info", "info"])
+
+    def test_concurrent_first_requests_start_one_thread(self):
+        """Racing first requests share a single worker thread."""
+        worker = CoalescingWorker(lambda: None, "info-race")
+        barrier = threading.Barrier(8)
+
+        def request():
+            barrier.wait(1)
+            worker.request()
+
+        callers = [threading.Thread(target=request) for _ in range(8)]
+        for caller in callers:
+            caller.start()
+        for caller in callers:
+            caller.join(1)
+        alive = [t for t in threading.enumerate() if t.name == "info-race"]
+        self.assertEqual(len(alive), 1)
+
+    def test_failed_job_does_not_stop_later_runs(self):
+        """A job that raises is reported and a request made meanwhile still runs."""
+        started, release, finished = threading.Event(), threading.Event(), threading.Event()
+        runs = []
+
+        def job():
+            runs.append(1)
+            if len(runs) == 1:
+                started.set()
+                release.wait(1)
+                raise RuntimeError("deque mutated during iteration")
+            finished.set()
+
+        reported = threading.Event()
+        with patch("threading.excepthook", side_effect=lambda _args: reported.set()):
+            worker = CoalescingWorker(job, "info-fail")
+            worker.request()
+            self.assertTrue(started.wait(1))
+            worker.request()
+            release.set()
+            self.assertTrue(finished.wait(1))
+            self.assertTrue(reported.wait(1))
+        self.assertEqual(len(runs), 2)
+
+if __name__ == "__main__":
+    unittest.main()